@@ -0,0 +1,443 @@
+"""Tests for the AST context index."""
+
+import os
+import shutil
+import sqlite3
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+pytest.importorskip("tree_sitter_c")
+
+from tis_driver_agent.context import index
+from tis_driver_agent.context.index import build_index
+from tis_driver_agent.context.lookup import (
+    IndexOutdatedError,
+    get_connection,
+    get_connection_cached,
+    close_all_connections,
+    find_factories,
+    find_initializers,
+    find_type,
+)
+from tis_driver_agent.context.assembler import assemble_context, get_context_summary
+from tis_driver_agent.utils.context_builder import ContextBuilder
+
+
+WIDGET_C = """\
+#include <stdlib.h>
+
+struct widget {
+    int size;
+    char *name;
+};
+
+typedef struct widget widget_t;
+
+typedef enum {
+    COLOR_RED,
+    COLOR_GREEN
+} color_t;
+
+/** Create a widget of the given size. */
+widget_t *widget_new(int size)
+{
+    widget_t *w = calloc(1, sizeof(*w));
+    w->size = size;
+    return w;
+}
+
+int widget_init(widget_t *w, int size)
+{
+    w->size = size;
+    return 0;
+}
+
+widget_t *widget_ref(widget_t *w)
+{
+    return w;
+}
+
+void widget_free(widget_t *w)
+{
+    free(w);
+}
+
+int widget_render(widget_t *w, color_t color)
+{
+    return w->size + color;
+}
+"""
+
+POOL_C = """\
+typedef struct allocator allocator_t;
+typedef struct pool pool_t;
+
+allocator_t *allocator_new(void)
+{
+    return 0;
+}
+
+pool_t *pool_new(allocator_t *a)
+{
+    return 0;
+}
+
+int pool_size(pool_t *p)
+{
+    return 0;
+}
+"""
+
+SHAPE_C = """\
+typedef struct shape shape_t;
+
+enum speed {
+    SPEED_FAST,
+    SPEED_SLOW
+};
+
+shape_t *shape_new(enum speed s)
+{
+    return 0;
+}
+
+int shape_area(shape_t *s)
+{
+    return 0;
+}
+"""
+
+GADGET_C = """\
+int gadget_count(int n)
+{
+    return n;
+}
+"""
+
+# Index schema as of version 2, before function_params and files
+SCHEMA_V2 = """
+CREATE TABLE functions (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    return_type TEXT NOT NULL,
+    return_type_normalized TEXT NOT NULL,
+    params_json TEXT,
+    file_path TEXT NOT NULL,
+    line_number INTEGER,
+    source TEXT,
+    doc_comment TEXT,
+    UNIQUE(name, file_path)
+);
+
+CREATE TABLE types (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE,
+    category TEXT NOT NULL,
+    enum_values_json TEXT,
+    file_path TEXT,
+    source TEXT,
+    pointer_to TEXT
+);
+
+CREATE TABLE meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+
+@pytest.fixture
+def source_dir():
+    """Create a temporary directory with C sources to index."""
+    temp_dir = tempfile.mkdtemp()
+    for name, content in (("widget.c", WIDGET_C), ("gadget.c", GADGET_C)):
+        with open(os.path.join(temp_dir, name), "w") as f:
+            f.write(content)
+    yield temp_dir
+    shutil.rmtree(temp_dir)
+
+
+@pytest.fixture
+def sources(source_dir):
+    """Paths of the sources to index."""
+    return [os.path.join(source_dir, "widget.c"), os.path.join(source_dir, "gadget.c")]
+
+
+@pytest.fixture
+def db_path(source_dir, sources):
+    """Build an index of the sources."""
+    path = os.path.join(source_dir, "index.db")
+    build_index(sources, path, workers=1)
+    return path
+
+
+@pytest.fixture
+def conn(db_path):
+    """Lookup connection to the index."""
+    conn = get_connection(db_path)
+    yield conn
+    conn.close()
+
+
+@pytest.fixture
+def parsed_files(monkeypatch):
+    """Record the files build_index parses."""
+    parsed = []
+    parse_file = index._parse_file
+
+    def recording_parse_file(file_path, content):
+        parsed.append(os.path.basename(file_path))
+        return parse_file(file_path, content)
+
+    monkeypatch.setattr(index, "_parse_file", recording_parse_file)
+    return parsed
+
+
+def make_v2_index(path, built_path):
+    """Copy the rows of a built index into a schema v2 index at path."""
+    conn = sqlite3.connect(path)
+    conn.executescript(SCHEMA_V2)
+    conn.execute("ATTACH DATABASE ? AS built", (built_path,))
+    conn.execute(
+        "INSERT INTO functions SELECT id, name, return_type, return_type_normalized, "
+        "params_json, file_path, line_number, source, doc_comment FROM built.functions"
+    )
+    conn.execute(
+        "INSERT INTO types SELECT id, name, category, enum_values_json, file_path, "
+        "source, pointer_to FROM built.types"
+    )
+    conn.execute("INSERT INTO meta VALUES ('schema_version', '2')")
+    conn.commit()
+    conn.close()
+
+
+class TestLookup:
+    def test_build_stats(self, sources, source_dir):
+        stats = build_index(sources, os.path.join(source_dir, "stats.db"), workers=1)
+        assert stats == {"functions": 6, "types": 3, "files": 2}
+
+    def test_build_with_process_pool(self, sources, source_dir, conn, monkeypatch):
+        monkeypatch.setattr(index, "PARALLEL_MIN_FILES", 1)
+        pool_path = os.path.join(source_dir, "pool.db")
+        stats = build_index(sources, pool_path, workers=2)
+        assert stats == {"functions": 6, "types": 3, "files": 2}
+
+        pool_conn = get_connection(pool_path)
+        try:
+            query = "SELECT name, file_path, source FROM functions ORDER BY id"
+            assert pool_conn.execute(query).fetchall() == conn.execute(query).fetchall()
+        finally:
+            pool_conn.close()
+
+    def test_find_factories(self, conn):
+        names = [f.name for f in find_factories(conn, "widget_t *")]
+        assert names == ["widget_new"]
+
+    def test_find_factories_unknown_type(self, conn):
+        assert find_factories(conn, "gizmo_t *") == []
+
+    def test_find_initializers(self, conn):
+        names = [f.name for f in find_initializers(conn, "widget_t *")]
+        assert names == ["widget_init"]
+
+    def test_assemble_context(self, db_path):
+        context = assemble_context(db_path, "widget_render")
+        assert "int widget_render(widget_t *w, color_t color);" in context
+        assert "#### Constructors for `widget_t`" in context
+        assert "widget_t *widget_new(int size);" in context
+        assert "extern int widget_init(widget_t *w, int size);" in context
+        assert "typedef struct widget widget_t;" in context
+        assert "COLOR_GREEN" in context
+        assert "widget_ref" not in context
+        assert "widget_free" not in context
+
+    def test_context_summary_follows_factory_dependencies(self, source_dir):
+        pool_path = os.path.join(source_dir, "pool.c")
+        with open(pool_path, "w") as f:
+            f.write(POOL_C)
+        path = os.path.join(source_dir, "pool.db")
+        build_index([pool_path], path, workers=1)
+
+        summary = get_context_summary(path, "pool_size")
+        assert summary["factories"] == {
+            "pool_t": ["pool_new"],
+            "allocator_t": ["allocator_new"],
+        }
+        context = assemble_context(path, "pool_size")
+        assert "#### Constructors for `pool_t`" in context
+        assert "#### Constructors for `allocator_t`" not in context
+
+    def test_assemble_context_includes_factory_enum_params(self, source_dir):
+        shape_path = os.path.join(source_dir, "shape.c")
+        with open(shape_path, "w") as f:
+            f.write(SHAPE_C)
+        path = os.path.join(source_dir, "shape.db")
+        build_index([shape_path], path, workers=1)
+
+        context = assemble_context(path, "shape_area")
+        assert "shape_t *shape_new(enum speed s);" in context
+        assert "SPEED_SLOW" in context
+
+    def test_assemble_context_unknown_function(self, db_path):
+        context = assemble_context(db_path, "no_such_function")
+        assert "not found in index" in context
+
+
+class TestCachedConnection:
+    def test_memoized_results_are_copies(self, db_path):
+        conn = get_connection_cached(db_path)
+        try:
+            factory = find_factories(conn, "widget_t *")[0]
+            factory.params.append(None)
+            assert find_factories(conn, "widget_t *")[0].params == factory.params[:1]
+        finally:
+            close_all_connections()
+
+    def test_connection_per_thread(self, db_path):
+        conn = get_connection_cached(db_path)
+        try:
+            with ThreadPoolExecutor(max_workers=1) as executor:
+                other = executor.submit(get_connection_cached, db_path).result()
+                with pytest.raises(sqlite3.ProgrammingError):
+                    executor.submit(conn.execute, "SELECT 1").result()
+            assert other is not conn
+            assert get_connection_cached(db_path) is conn
+        finally:
+            close_all_connections()
+
+
+class TestSchemaMigration:
+    def test_lookup_rejects_v2_index(self, source_dir, db_path):
+        v2_path = os.path.join(source_dir, "index_v2.db")
+        make_v2_index(v2_path, db_path)
+
+        with pytest.raises(IndexOutdatedError, match="reindex --full"):
+            get_connection(v2_path)
+
+    def test_ast_context_falls_back_on_v2_index(self, source_dir, db_path):
+        v2_path = os.path.join(source_dir, "index_v2.db")
+        make_v2_index(v2_path, db_path)
+
+        builder = ContextBuilder(file_reader=lambda path: None)
+        context_files = builder.build(
+            mode="ast",
+            source_content=GADGET_C,
+            source_filename="gadget.c",
+            function_name="gadget_count",
+            index_path=v2_path,
+        )
+        assert context_files == [{"name": "gadget_count()", "content": GADGET_C.strip()}]
+
+    def test_build_upgrades_v2_index(self, sources, source_dir, db_path):
+        v2_path = os.path.join(source_dir, "index_v2.db")
+        make_v2_index(v2_path, db_path)
+        build_index(sources, v2_path, workers=1)
+
+        conn = get_connection(v2_path)
+        try:
+            names = [f.name for f in find_initializers(conn, "widget_t *")]
+        finally:
+            conn.close()
+        assert names == ["widget_init"]
+
+
+class TestIncrementalBuild:
+    def test_unchanged_files_skipped(self, sources, db_path, parsed_files):
+        stats = build_index(sources, db_path, workers=1)
+        assert parsed_files == []
+        assert stats == {"functions": 6, "types": 3, "files": 2}
+
+    def test_changed_file_reparsed(self, sources, db_path, parsed_files):
+        with open(sources[1], "a") as f:
+            f.write("\nint gadget_reset(int n)\n{\n    return 0;\n}\n")
+
+        stats = build_index(sources, db_path, workers=1)
+        assert parsed_files == ["gadget.c"]
+        assert stats["functions"] == 7
+
+        conn = get_connection(db_path)
+        try:
+            names = {row[0] for row in conn.execute("SELECT name FROM functions")}
+        finally:
+            conn.close()
+        assert "gadget_reset" in names
+
+    def test_changed_file_drops_removed_rows(self, sources, db_path):
+        with open(sources[1], "w") as f:
+            f.write(GADGET_C.replace("gadget_count", "gadget_total"))
+
+        stats = build_index(sources, db_path, workers=1)
+        assert stats["functions"] == 6
+
+        conn = get_connection(db_path)
+        try:
+            rows = conn.execute(
+                "SELECT f.name, COUNT(p.function_id) FROM functions f "
+                "LEFT JOIN function_params p ON p.function_id = f.id "
+                "WHERE f.file_path = ? GROUP BY f.id",
+                (sources[1],),
+            ).fetchall()
+        finally:
+            conn.close()
+        assert rows == [("gadget_total", 1)]
+
+    def test_removed_file_dropped(self, sources, db_path):
+        stats = build_index(sources[:1], db_path, workers=1)
+        assert stats == {"functions": 5, "types": 3, "files": 1}
+
+        conn = get_connection(db_path)
+        try:
+            paths = {row[0] for row in conn.execute(
+                "SELECT file_path FROM functions UNION SELECT path FROM files"
+            )}
+        finally:
+            conn.close()
+        assert paths == {sources[0]}
+
+    def test_type_kept_when_removed_from_one_of_two_files(self, sources, db_path):
+        with open(sources[1], "a") as f:
+            f.write("\nstruct widget {\n    int size;\n};\n")
+        build_index(sources, db_path, workers=1)
+        with open(sources[1], "w") as f:
+            f.write(GADGET_C)
+
+        stats = build_index(sources, db_path, workers=1)
+        assert stats["types"] == 3
+
+        conn = get_connection(db_path)
+        try:
+            widget = find_type(conn, "struct widget")
+        finally:
+            conn.close()
+        assert widget.file_path == sources[0]
+
+    def test_type_from_last_listed_file_after_partial_reindex(self, sources, db_path):
+        with open(sources[1], "a") as f:
+            f.write("\nstruct widget {\n    long size;\n};\n")
+        build_index(sources, db_path, workers=1)
+        # Reparse only the earlier-listed of the two files defining the type
+        with open(sources[0], "a") as f:
+            f.write("\nint widget_size(widget_t *w)\n{\n    return w->size;\n}\n")
+        build_index(sources, db_path, workers=1)
+
+        conn = get_connection(db_path)
+        try:
+            widget = find_type(conn, "struct widget")
+        finally:
+            conn.close()
+        assert widget.file_path == sources[1]
+        assert "long size" in widget.source
+
+    def test_full_build_reparses(self, sources, db_path, parsed_files):
+        build_index(sources, db_path, workers=1, incremental=False)
+        assert parsed_files == ["widget.c", "gadget.c"]
+
+    def test_schema_v2_upgrade_reparses(self, sources, source_dir, db_path, parsed_files):
+        v2_path = os.path.join(source_dir, "index_v2.db")
+        make_v2_index(v2_path, db_path)
+
+        stats = build_index(sources, v2_path, workers=1)
+        assert parsed_files == ["widget.c", "gadget.c"]
+        assert stats == {"functions": 6, "types": 3, "files": 2}
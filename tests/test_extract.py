@@ -0,0 +1,66 @@
+"""Tests for code extraction from model responses."""
+
+from tis_driver_agent.models.extract import extract_code, read_until_code_block
+
+
+class Stream:
+    """Chunk iterator that records how far it was read and whether it was closed."""
+
+    def __init__(self, chunks):
+        self.chunks = list(chunks)
+        self.read = 0
+        self.closed = False
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        if self.read == len(self.chunks):
+            raise StopIteration
+        self.read += 1
+        return self.chunks[self.read - 1]
+
+    def close(self):
+        self.closed = True
+
+
+class TestReadUntilCodeBlock:
+    def test_stops_after_closing_fence(self):
+        stream = Stream(["Here:\n```c\nint x;\n", "```\n", "Explanation", " of the code"])
+        response, truncated = read_until_code_block(stream)
+
+        assert response == "Here:\n```c\nint x;\n```\n"
+        assert truncated
+        assert stream.read == 2
+        assert stream.closed
+
+    def test_reads_everything_without_closing_fence(self):
+        stream = Stream(["```c\n", "int x;\n", "int y;"])
+        response, truncated = read_until_code_block(stream)
+
+        assert response == "```c\nint x;\nint y;"
+        assert not truncated
+        assert stream.closed
+
+    def test_fences_split_across_chunks(self):
+        stream = Stream(["text `", "`", "`c\nint x;\n`", "`", "`", "more"])
+        response, truncated = read_until_code_block(stream)
+
+        assert response == "text ```c\nint x;\n```"
+        assert truncated
+        assert extract_code(response) == "int x;"
+
+    def test_skips_fenced_block_of_another_language(self):
+        stream = Stream(["```sh\nmake\n```\n", "```c\nint x;\n```", "\nDone."])
+        response, truncated = read_until_code_block(stream)
+
+        assert response == "```sh\nmake\n```\n```c\nint x;\n```"
+        assert truncated
+        assert extract_code(response) == "int x;"
+
+    def test_empty_code_block(self):
+        stream = Stream(["```c```", "rest"])
+        response, truncated = read_until_code_block(stream)
+
+        assert response == "```c```"
+        assert truncated
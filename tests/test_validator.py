@@ -0,0 +1,96 @@
+"""Tests for the validator node's compile cache."""
+
+from tis_driver_agent.nodes.validator import validator_node
+from tis_driver_agent.tis.base import TISRunnerBase, TISResult
+from tis_driver_agent.tis.local import LocalTISRunner
+
+
+class FakeRunner(TISRunnerBase):
+    """Runner that counts compiles and returns a fixed exit code."""
+
+    def __init__(self, exit_code=0, digest="digest"):
+        self.exit_code = exit_code
+        self.digest = digest
+        self.compiles = 0
+
+    def tis_compile(self, driver_path, source_files, reference_file,
+                    compilation_db=None, function_name=None):
+        self.compiles += 1
+        return TISResult(
+            success=self.exit_code == 0,
+            stdout="",
+            stderr="",
+            exit_code=self.exit_code,
+            errors=[] if self.exit_code == 0 else ["error"],
+            command="tis-analyzer",
+        )
+
+    def write_driver(self, driver_code, driver_path):
+        return True
+
+    def cleanup(self, driver_path):
+        pass
+
+    def file_digest(self, file_path):
+        return self.digest
+
+
+def make_state(driver_code="int main(void) { return 0; }"):
+    return {
+        "function_name": "foo",
+        "source_file": "foo.c",
+        "current_driver_code": driver_code,
+        "iteration": 1,
+    }
+
+
+class TestCompileCache:
+    def test_same_driver_not_compiled_again(self):
+        runner = FakeRunner()
+        first = validator_node(make_state(), runner)
+        second = validator_node(make_state(), runner)
+
+        assert runner.compiles == 1
+        assert second == first
+
+    def test_changed_driver_compiled(self):
+        runner = FakeRunner()
+        validator_node(make_state(), runner)
+        validator_node(make_state("int main(void) { return 1; }"), runner)
+
+        assert runner.compiles == 2
+
+    def test_changed_source_compiled(self):
+        runner = FakeRunner()
+        validator_node(make_state(), runner)
+        runner.digest = "edited"
+        validator_node(make_state(), runner)
+
+        assert runner.compiles == 2
+
+    def test_unknown_source_digest_not_cached(self):
+        runner = FakeRunner(digest=None)
+        validator_node(make_state(), runner)
+        validator_node(make_state(), runner)
+
+        assert runner.compiles == 2
+
+    def test_runner_failure_not_cached(self):
+        runner = FakeRunner(exit_code=-1)
+        result = validator_node(make_state(), runner)
+        validator_node(make_state(), runner)
+
+        assert runner.compiles == 2
+        assert result["validation_errors"][0]["stage"] == "tis_compile"
+
+
+class TestLocalFileDigest:
+    def test_digest_follows_contents(self, tmp_path):
+        runner = LocalTISRunner(work_dir=str(tmp_path))
+        (tmp_path / "foo.c").write_text("int x;")
+        digest = runner.file_digest("foo.c")
+        (tmp_path / "foo.c").write_text("int y;")
+
+        assert digest is not None
+        assert runner.file_digest("foo.c") != digest
+        assert runner.file_digest("missing.c") is None
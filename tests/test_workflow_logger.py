@@ -0,0 +1,78 @@
+"""Tests for the structured workflow logger."""
+
+import gc
+import json
+import os
+import shutil
+import threading
+
+from tis_driver_agent.workflow_logger import StructuredLogger
+
+
+def writer_threads():
+    """Live structured logger writer threads."""
+    return [t for t in threading.enumerate() if t.name == "structured-logger"]
+
+
+class TestStructuredLogger:
+    def test_files_written_in_order(self, tmp_path):
+        logger = StructuredLogger(str(tmp_path))
+        for iteration in range(1, 21):
+            logger.log_driver_code(f"int x = {iteration};", "generator", iteration)
+        assert logger.flush() == []
+
+        names = sorted(os.listdir(tmp_path))
+        assert names[0] == "001_generator_iter1_driver.c"
+        assert len(names) == 20
+        with open(tmp_path / names[-1]) as f:
+            assert f.read().endswith("int x = 20;")
+        logger.close()
+
+    def test_data_snapshotted_when_logged(self, tmp_path):
+        logger = StructuredLogger(str(tmp_path))
+        tis_result = {"success": True, "errors": []}
+        path = logger.log_validation(iteration=1, tis_result=tis_result, is_valid=True)
+        tis_result["errors"].append("changed after logging")
+        logger.close()
+
+        with open(path) as f:
+            assert json.load(f)["tis_compile"] == {"success": True, "errors": []}
+
+    def test_close_writes_pending_and_stops_thread(self, tmp_path):
+        logger = StructuredLogger(str(tmp_path))
+        path = logger.log_summary(True, 1, "foo", "foo.c")
+        assert logger.close() == []
+
+        assert os.path.exists(path)
+        assert writer_threads() == []
+
+    def test_write_after_close(self, tmp_path):
+        logger = StructuredLogger(str(tmp_path))
+        logger.close()
+
+        path = logger.log_driver_code("int x;", "refiner", 2)
+        assert os.path.exists(path)
+        assert logger.close() == []
+
+    def test_failed_write_reported(self, tmp_path, capsys):
+        logs_dir = tmp_path / "logs"
+        logger = StructuredLogger(str(logs_dir))
+        shutil.rmtree(logs_dir)
+
+        path = logger.log_driver_code("int x;", "generator", 1)
+        failures = logger.flush()
+
+        assert [failed_path for failed_path, _ in failures] == [path]
+        assert isinstance(failures[0][1], OSError)
+        assert "Failed to write log file" in capsys.readouterr().err
+        # Reported once
+        assert logger.close() == []
+
+    def test_unclosed_logger_stops_when_collected(self, tmp_path):
+        logger = StructuredLogger(str(tmp_path))
+        path = logger.log_summary(False, 3, "foo", "foo.c")
+        del logger
+        gc.collect()
+
+        assert os.path.exists(path)
+        assert writer_threads() == []
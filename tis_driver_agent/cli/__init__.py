@@ -136,6 +136,10 @@ Default: gpt-4o-mini. Use 'tischiron models' for full list."""
     reindex_parser.add_argument(
         "project", help="Project name"
     ).completer = ProjectCompleter()
+    reindex_parser.add_argument(
+        "--full", action="store_true",
+        help="Reparse every file, including files unchanged since the last index",
+    )
 
     # models command
     subparsers.add_parser(
@@ -22,6 +22,7 @@ def cmd_context(args):
 
     try:
         from ...context.assembler import assemble_context, get_context_summary
+        from ...context.lookup import IndexOutdatedError
 
         # Show summary
         summary = get_context_summary(index_path, args.function)
@@ -68,6 +69,10 @@ def cmd_context(args):
     except ImportError as e:
         print(f"Error: Context module not available ({e})")
         return 1
+    except IndexOutdatedError:
+        print(f"Error: The AST index of '{args.project}' was built by an older version")
+        print(f"Run 'tischiron reindex --full {args.project}' to rebuild it")
+        return 1
     except Exception as e:
         print(f"Error: {e}")
         return 1
@@ -12,6 +12,7 @@ from ...models.factory import create_model_adapter
 from ...tis.remote import RemoteTISRunner
 from ...tis.local import LocalTISRunner
 from ...graph import create_workflow
+from ...nodes.validator import driver_filename
 from ...workflow_logger import (
     WorkflowLogger,
     StructuredLogger,
@@ -121,6 +122,9 @@ def cmd_gen(args):
             remote_work_dir=project_config.remote_work_dir,
         )
 
+    model_adapter = None
+    app = None
+    result = None
     try:
         tis_runner.connect()
 
@@ -234,9 +238,11 @@ def cmd_gen(args):
         if args.verbose:
             # Stream through nodes to show progress
             print("\n[Step 1] Planning...", flush=True)
+            # Nodes return only the keys they change; merge to track full state
+            state = dict(initial_state)
             for step in app.stream(initial_state, workflow_config):
                 node_name = list(step.keys())[0]
-                state = step[node_name]
+                state.update(step[node_name])
                 status = state.get("status", "unknown")
                 iteration = state.get("iteration", 0)
 
@@ -326,6 +332,19 @@ def cmd_gen(args):
             sys.exit(1)
 
     finally:
+        # Release pooled model connections (Ollama)
+        if hasattr(model_adapter, "close"):
+            model_adapter.close()
+        # A completed workflow removes its driver file (output handler);
+        # remove it here if the workflow was interrupted
+        if app is not None and result is None:
+            try:
+                tis_runner.cleanup(driver_filename(args.function))
+            except Exception:
+                pass  # Don't skip the rest of the teardown
         tis_runner.disconnect()
         if args.verbose and not use_local_mode:
             print("Disconnected from remote server")
+        # Wait for background log writes
+        if structured_logger:
+            structured_logger.close()
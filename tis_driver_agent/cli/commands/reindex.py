@@ -48,6 +48,7 @@ def cmd_reindex(args):
         stats = build_index(
             files=files_to_index,
             db_path=index_path,
+            incremental=not getattr(args, 'full', False),
         )
 
         elapsed = time.time() - start_time
@@ -4,11 +4,18 @@ from .models import FunctionInfo, TypeInfo, Param
 from .index import build_index, get_index_stats
 from .parser import extract_functions, extract_types, normalize_type, categorize_type
 from .lookup import (
+    IndexOutdatedError,
     get_connection,
+    get_connection_cached,
+    close_all_connections,
+    clear_lookup_cache,
     get_function,
     find_factories,
+    find_factories_batch,
     find_initializers,
     find_type,
+    find_types,
+    collect_factories,
     collect_factories_recursive,
     search_functions,
 )
@@ -28,11 +35,18 @@ __all__ = [
     "normalize_type",
     "categorize_type",
     # Lookup
+    "IndexOutdatedError",
     "get_connection",
+    "get_connection_cached",
+    "close_all_connections",
+    "clear_lookup_cache",
     "get_function",
     "find_factories",
+    "find_factories_batch",
     "find_initializers",
     "find_type",
+    "find_types",
+    "collect_factories",
     "collect_factories_recursive",
     "search_functions",
     # Assembler
@@ -1,20 +1,84 @@
 """Assemble context for LLM prompt injection."""
 
+import io
 import os
 import re
-from typing import Dict, List, Optional, Set
+import sqlite3
+from typing import Dict, Iterable, List, Optional, Set, Tuple
 
-from .models import FunctionInfo, TypeInfo
+from .models import FunctionInfo, TypeInfo, Param
 from .lookup import (
-    get_connection,
+    get_connection_cached,
     get_function,
-    collect_factories_recursive,
+    collect_factories,
     find_initializers,
-    find_type,
+    find_types,
 )
 from .parser import normalize_type, categorize_type
 
 
+# Fixed section headers, emitted with a single write each
+_FACTORY_HEADER = (
+    "### Object Creation API (Factory Pattern)\n"
+    "\n"
+    "**CRITICAL: Use these constructor functions to create objects.**\n"
+    "**DO NOT use `tis_alloc()`, `malloc()`, or manual struct allocation for these types.**\n"
+    "\n"
+)
+
+_INITIALIZER_HEADER = (
+    "### Object Initialization API (Initializer Pattern)\n"
+    "\n"
+    "**These types use the INITIALIZER pattern:** allocate the struct yourself, then call an initializer.\n"
+    "\n"
+)
+
+_EXTERN_HEADER = (
+    "### Required Extern Declarations\n"
+    "\n"
+    "**Copy these declarations into your driver:**\n"
+    "\n"
+    "```c\n"
+)
+
+_PARAM_GUIDE_HEADER = (
+    "### Parameter Initialization Guide\n"
+    "\n"
+    "| Parameter | Type | Recommended Approach |\n"
+    "|-----------|------|---------------------|\n"
+)
+
+# Parameter guide entries that depend only on the type category
+_CATEGORY_APPROACHES = {
+    'string': "`malloc()` + `tis_make_unknown()` + null-terminate",
+    'enum': "`tis_interval()` over enum range",
+    'primitive': "`tis_int_interval()` or specific value",
+    'func_ptr': "`NULL` or stub function",
+}
+
+# Standard C types and keywords we don't need to define
+_STANDARD_TYPES = frozenset({
+    'void', 'int', 'char', 'short', 'long', 'float', 'double',
+    'unsigned', 'signed', 'const', 'volatile', 'static', 'extern',
+    'struct', 'enum', 'union', 'typedef',
+    'size_t', 'ssize_t', 'ptrdiff_t',
+    'int8_t', 'int16_t', 'int32_t', 'int64_t',
+    'uint8_t', 'uint16_t', 'uint32_t', 'uint64_t',
+    'bool', '_Bool', 'FILE',
+})
+
+# Prefixes of API function names that must not be mistaken for types (json-c)
+FUNCTION_NAME_PREFIXES = ('json_object_', 'json_tokener_')
+
+# Type-name candidates in one pass: identifiers ending in a common type
+# suffix, or identifiers followed by a parameter name ("ident name," / "ident name)")
+_TYPE_CANDIDATE_RE = re.compile(
+    r'\b(?=[a-zA-Z_])'
+    r'([a-zA-Z0-9_]*(?:_t|_type|_bool|_error|_state|_flags)\b'
+    r'|[a-zA-Z0-9_]+\b(?=\s+\w+[,)]))'
+)
+
+
 def add_struct_keyword_to_signature(sig: str, opaque_types: Set[str]) -> str:
     """
     Ensure opaque type names in a signature use the 'struct' keyword.
@@ -41,59 +105,81 @@ def add_struct_keyword_to_signature(sig: str, opaque_types: Set[str]) -> str:
     return result
 
 
-def extract_type_identifiers(signatures: List[str]) -> Set[str]:
+def _is_static(sig: str) -> bool:
+    """
+    Check whether a signature declares a static (file-local) function.
+
+    Only the declaration specifiers before the parameter list are looked at,
+    so parameter names such as `is_static` don't produce false positives.
+    """
+    return 'static' in sig.partition('(')[0].split()
+
+
+def extract_type_identifiers(
+    signatures: List[str],
+    function_prefixes: Tuple[str, ...] = FUNCTION_NAME_PREFIXES,
+) -> Set[str]:
     """
     Extract all type identifiers from function signatures.
 
     Looks for potential typedef/enum names that aren't standard C types.
+
+    Args:
+        signatures: Function signatures to scan
+        function_prefixes: Name prefixes of the project's API functions;
+                           identifiers starting with them are never types
     """
-    all_text = ' '.join(signatures)
-
-    # Standard C types we don't need to define
-    standard_types = {
-        'void', 'int', 'char', 'short', 'long', 'float', 'double',
-        'unsigned', 'signed', 'const', 'volatile', 'static', 'extern',
-        'struct', 'enum', 'union', 'typedef',
-        'size_t', 'ssize_t', 'ptrdiff_t',
-        'int8_t', 'int16_t', 'int32_t', 'int64_t',
-        'uint8_t', 'uint16_t', 'uint32_t', 'uint64_t',
-        'bool', '_Bool', 'FILE',
+    # Type names typically end with _t, _type, _bool, etc. or are used
+    # before a parameter name; anything else is a function or param name
+    candidates = set()
+    for sig in signatures:
+        candidates.update(_TYPE_CANDIDATE_RE.findall(sig))
+
+    # Filter out standard types and the project's own function names
+    potential_types = {
+        ident for ident in candidates - _STANDARD_TYPES
+        if not ident.startswith(function_prefixes)
     }
 
-    # Find all identifiers (words that could be type names)
-    # Pattern: word characters that aren't preceded by 'struct ' or 'enum '
-    identifiers = set(re.findall(r'\b([a-zA-Z_][a-zA-Z0-9_]*)\b', all_text))
-
-    # Filter out standard types and common keywords
-    custom_types = identifiers - standard_types
-
-    # Filter out things that are clearly not types (function names, param names)
-    # Type names typically end with _t, _type, _bool, etc. or are used in specific contexts
-    potential_types = set()
-    for ident in custom_types:
-        # Skip if it looks like a function name (starts with project prefix and has verb)
-        if re.match(r'^(json_object_|json_tokener_)\w+$', ident):
-            continue
-        # Keep if it looks like a type (ends with common type suffixes)
-        if re.search(r'(_t|_type|_bool|_error|_state|_flags)$', ident):
-            potential_types.add(ident)
-        # Also keep short identifiers that appear before a parameter name
-        elif re.search(rf'\b{ident}\s+\w+[,)]', all_text):
-            potential_types.add(ident)
-
     return potential_types
 
 
-def resolve_type_definitions(conn, type_names: Set[str]) -> Dict[str, str]:
+def _prefetch_types(
+    conn,
+    type_names: Iterable[str],
+    type_cache: Dict[str, Optional[TypeInfo]],
+) -> None:
+    """Fetch the names missing from type_cache in one batch (keyed by normalized name)."""
+    missing = [t for t in type_names if normalize_type(t) not in type_cache]
+    if not missing:
+        return
+    found = find_types(conn, missing)
+    for type_name in missing:
+        type_cache[normalize_type(type_name)] = found.get(type_name)
+
+
+def resolve_type_definitions(
+    conn,
+    type_names: Set[str],
+    type_cache: Optional[Dict[str, Optional[TypeInfo]]] = None,
+) -> Dict[str, str]:
     """
     Look up type definitions from the index.
 
+    Args:
+        conn: Database connection
+        type_names: Type names to resolve
+        type_cache: Optional lookup memo shared with the caller
+
     Returns dict of {type_name: definition_source}
     """
     definitions = {}
+    if type_cache is None:
+        type_cache = {}
+    _prefetch_types(conn, type_names, type_cache)
 
-    for type_name in type_names:
-        type_info = find_type(conn, type_name)
+    for type_name in sorted(type_names):
+        type_info = type_cache[normalize_type(type_name)]
         if type_info and type_info.source:
             definitions[type_name] = type_info.source
 
@@ -105,6 +191,7 @@ def assemble_context(
     function_name: str,
     max_depth: int = 2,
     include_types: bool = True,
+    conn: Optional[sqlite3.Connection] = None,
 ) -> str:
     """
     Assemble context for generating a test driver.
@@ -114,93 +201,98 @@ def assemble_context(
         function_name: Name of the target function
         max_depth: Max recursion depth for factory dependencies
         include_types: Whether to include type definitions
+        conn: Connection to use (default: the shared cached connection
+              for index_path)
 
     Returns:
         Formatted markdown context for prompt injection
     """
-    conn = get_connection(index_path)
-
-    try:
-        # 1. Get target function
-        target = get_function(conn, function_name)
-        if not target:
-            return f"<!-- Function '{function_name}' not found in index -->"
-
-        # 2. Extract parameter types
-        param_types = []
-        for param in target.params:
-            category = categorize_type(param.type)
-            if category == 'struct_ptr':
-                param_types.append(param.type)
-
-        # 3. Collect factories for each type (with semantic filtering)
-        factories: Dict[str, List[FunctionInfo]] = {}
-        visited = set()
-
-        for ptype in param_types:
-            collect_factories_recursive(
-                conn, ptype, factories, visited,
-                depth=0, max_depth=1,
-                target_function_name=function_name,
-            )
-
-        # 4. Collect initializers for each type (for types without factories)
-        initializers: Dict[str, List[FunctionInfo]] = {}
-        for ptype in param_types:
-            normalized = normalize_type(ptype)
-            # Find initializers for this type
-            type_initializers = find_initializers(conn, ptype, function_name)
-            if type_initializers:
-                initializers[normalized] = type_initializers
-
-        # 5. Get type definitions
-        type_defs: Dict[str, TypeInfo] = {}
-        if include_types:
-            for ptype in param_types:
-                type_info = find_type(conn, ptype)
-                if type_info:
-                    type_defs[normalize_type(ptype)] = type_info
-
-            # Also get enum types used in top factories/initializers
-            all_funcs = []
-            for funcs in factories.values():
-                all_funcs.extend(funcs[:3])
-            for funcs in initializers.values():
-                all_funcs.extend(funcs[:3])
-
-            for func in all_funcs:
+    if conn is None:
+        conn = get_connection_cached(index_path)
+
+    # 1. Get target function
+    target = get_function(conn, function_name)
+    if not target:
+        return f"<!-- Function '{function_name}' not found in index -->"
+
+    # 2. Categorize parameters once and extract struct pointer types
+    param_categories = [(p, categorize_type(p.type)) for p in target.params]
+    param_types = [p.type for p, category in param_categories if category == 'struct_ptr']
+
+    # Normalize each parameter type once; reused by every step below
+    normalized_of = {pt: normalize_type(pt) for pt in param_types}
+    # Only these types get constructors and initializers rendered
+    target_param_types = set(normalized_of.values())
+    # Distinct normalized types, in parameter order
+    unique_types = list(dict.fromkeys(normalized_of.values()))
+
+    # Type lookups shared by steps 5 and 6 (keyed by normalized name)
+    type_cache: Dict[str, Optional[TypeInfo]] = {}
+
+    # 3. Collect factories for each type (with semantic filtering)
+    factories: Dict[str, List[FunctionInfo]] = {}
+    visited = set()
+
+    collect_factories(
+        conn, param_types, factories, visited,
+        max_depth=1,
+        target_function_name=function_name,
+    )
+
+    # 4. Collect initializers for each type (for types without factories)
+    initializers: Dict[str, List[FunctionInfo]] = {}
+    for normalized in unique_types:
+        # Find initializers for this type
+        type_initializers = find_initializers(conn, normalized, function_name)
+        if type_initializers:
+            initializers[normalized] = type_initializers
+
+    # 5. Get type definitions
+    type_defs: Dict[str, TypeInfo] = {}
+    if include_types:
+        _prefetch_types(conn, unique_types, type_cache)
+        for normalized in unique_types:
+            type_info = type_cache[normalized]
+            if type_info:
+                type_defs[normalized] = type_info
+
+    # 6. Collect function signatures and resolve type dependencies
+    all_signatures = []
+    for funcs in factories.values():
+        for func in funcs[:5]:
+            if not _is_static(func.signature):
+                all_signatures.append(func.signature)
+    for funcs in initializers.values():
+        for func in funcs[:5]:
+            if not _is_static(func.signature):
+                all_signatures.append(func.signature)
+
+    # Enum parameter types of the top factories/initializers, resolved in
+    # the same batch as the signature types below
+    enum_types: Dict[str, None] = {}
+    if include_types:
+        for funcs in (*factories.values(), *initializers.values()):
+            for func in funcs[:3]:
                 for param in func.params:
                     if categorize_type(param.type) == 'enum':
-                        enum_info = find_type(conn, param.type)
-                        if enum_info:
-                            type_defs[normalize_type(param.type)] = enum_info
+                        enum_types[param.type] = None
 
-        # 6. Collect function signatures and resolve type dependencies
-        all_signatures = []
-        for funcs in factories.values():
-            for func in funcs[:5]:
-                sig = func.source.split('{')[0].strip() if '{' in func.source else func.source.strip()
-                if 'static ' not in sig:
-                    all_signatures.append(sig)
-        for funcs in initializers.values():
-            for func in funcs[:5]:
-                sig = func.source.split('{')[0].strip() if '{' in func.source else func.source.strip()
-                if 'static ' not in sig:
-                    all_signatures.append(sig)
-
-        # Extract and resolve type dependencies from signatures
-        required_type_names = extract_type_identifiers(all_signatures)
-        required_type_defs = resolve_type_definitions(conn, required_type_names)
+    # Extract and resolve type dependencies from signatures
+    required_type_names = extract_type_identifiers(all_signatures)
+    _prefetch_types(conn, [*required_type_names, *enum_types], type_cache)
+    required_type_defs = resolve_type_definitions(conn, required_type_names, type_cache)
 
-        # 7. Format context (pass target param types for forward declarations)
-        target_param_types = set(normalize_type(pt) for pt in param_types)
-        return format_context(
-            target, factories, initializers, type_defs,
-            required_type_defs, target_param_types
-        )
+    for enum_type in enum_types:
+        normalized = normalize_type(enum_type)
+        enum_info = type_cache[normalized]
+        if enum_info:
+            type_defs[normalized] = enum_info
 
-    finally:
-        conn.close()
+    # 7. Format context (pass target param types for forward declarations)
+    return format_context(
+        target, factories, initializers, type_defs,
+        required_type_defs, target_param_types, param_categories
+    )
 
 
 def format_context(
@@ -210,6 +302,7 @@ def format_context(
     type_defs: Dict[str, TypeInfo],
     required_type_defs: Optional[Dict[str, str]] = None,
     target_param_types: Optional[Set[str]] = None,
+    param_categories: Optional[List[Tuple[Param, str]]] = None,
 ) -> str:
     """
     Format collected context as markdown for LLM prompt.
@@ -221,50 +314,54 @@ def format_context(
         type_defs: Dict of type definitions
         required_type_defs: Dict of required type definitions from signatures
         target_param_types: Set of normalized type names that the target function needs
-                           (only these get forward declarations)
+                           (only these get constructors and initializers rendered)
+        param_categories: Optional precomputed (param, category) pairs for
+                          target.params, as built by assemble_context
 
     Includes doc comments when available.
     """
-    lines = []
+    buf = io.StringIO()
+    write = buf.write
+
+    def emit(line: str = "") -> None:
+        write(line)
+        write('\n')
 
     # Header
-    lines.append(f"## Context for generating test driver for `{target.name}`")
-    lines.append("")
+    emit(f"## Context for generating test driver for `{target.name}`")
+    emit()
 
     # Target function signature and documentation
-    lines.append("### Target Function")
+    emit("### Target Function")
     if target.doc_comment:
-        lines.append("")
-        lines.append("**Documentation:**")
-        lines.append("```")
-        lines.append(target.doc_comment)
-        lines.append("```")
-    lines.append("")
-    lines.append("**Signature:**")
-    lines.append("```c")
+        emit()
+        emit("**Documentation:**")
+        emit("```")
+        emit(target.doc_comment)
+        emit("```")
+    emit()
+    emit("**Signature:**")
+    emit("```c")
     # Extract just the signature (before the body)
-    sig = target.source.split('{')[0].strip() if '{' in target.source else target.source.strip()
-    if not sig.endswith(';'):
-        sig += ';'
-    lines.append(sig)
-    lines.append("```")
-    lines.append("")
+    emit(target.signature)
+    emit("```")
+    emit()
 
     # Include function body for context (helps LLM understand what to test)
     if '{' in target.source:
-        lines.append("**Implementation (for understanding what code paths to exercise):**")
-        lines.append("```c")
-        # Truncate very long bodies
-        body_lines = target.source.split('\n')
-        if len(body_lines) > 80:
-            lines.append('\n'.join(body_lines[:80]))
-            lines.append('// ... (truncated)')
+        emit("**Implementation (for understanding what code paths to exercise):**")
+        emit("```c")
+        # Truncate very long bodies (more than 80 lines); only those get split,
+        # and at most 80 lines are split off
+        if target.source.count('\n') >= 80:
+            emit('\n'.join(target.source.split('\n', 80)[:80]))
+            emit('// ... (truncated)')
         else:
-            lines.append(target.source)
-        lines.append("```")
-        lines.append("")
+            emit(target.source)
+        emit("```")
+        emit()
 
-    # Filter to relevant types only
+    # Filter to relevant types only; dependency factories are only declared
     relevant_factories = {
         k: v for k, v in factories.items()
         if not target_param_types or k in target_param_types
@@ -280,49 +377,39 @@ def format_context(
 
     # ========== FACTORY PATTERN (allocate + return) ==========
     if relevant_factories:
-        lines.append("### Object Creation API (Factory Pattern)")
-        lines.append("")
-        lines.append("**CRITICAL: Use these constructor functions to create objects.**")
-        lines.append("**DO NOT use `tis_alloc()`, `malloc()`, or manual struct allocation for these types.**")
-        lines.append("")
+        write(_FACTORY_HEADER)
 
         for type_name, funcs in relevant_factories.items():
             top_funcs = funcs[:10]
 
-            lines.append(f"#### Constructors for `{type_name}` (struct {type_name} *)")
-            lines.append("")
-            lines.append("Use one of these functions to create instances:")
-            lines.append("")
-            lines.append("```c")
+            write(
+                f"#### Constructors for `{type_name}` (struct {type_name} *)\n\n"
+                "Use one of these functions to create instances:\n\n"
+                "```c\n"
+            )
 
             for func in top_funcs:
                 if func.doc_comment:
                     doc_lines = func.doc_comment.strip().split('\n')
                     if len(doc_lines) > 5:
                         doc_lines = doc_lines[:5] + ['...']
-                    lines.append('\n'.join(doc_lines))
+                    emit('\n'.join(doc_lines))
 
                 basename = os.path.basename(func.file_path)
-                lines.append(f"// From {basename}:{func.line_number}")
+                emit(f"// From {basename}:{func.line_number}")
 
-                sig = func.source.split('{')[0].strip() if '{' in func.source else func.source.strip()
-                if not sig.endswith(';'):
-                    sig += ';'
-                lines.append(sig)
-                lines.append("")
+                emit(func.signature)
+                emit()
 
-            lines.append("```")
+            emit("```")
 
             if len(funcs) > 10:
-                lines.append(f"*({len(funcs) - 10} more constructors available)*")
-            lines.append("")
+                emit(f"*({len(funcs) - 10} more constructors available)*")
+            emit()
 
     # ========== INITIALIZER PATTERN (caller allocates, function initializes) ==========
     if relevant_initializers:
-        lines.append("### Object Initialization API (Initializer Pattern)")
-        lines.append("")
-        lines.append("**These types use the INITIALIZER pattern:** allocate the struct yourself, then call an initializer.")
-        lines.append("")
+        write(_INITIALIZER_HEADER)
 
         for type_name, funcs in relevant_initializers.items():
             top_funcs = funcs[:10]
@@ -331,62 +418,62 @@ def format_context(
             type_info = type_defs.get(type_name)
             underlying_struct = type_info.pointer_to if type_info and type_info.pointer_to else type_name
 
-            lines.append(f"#### Initializers for `{type_name}`")
-            lines.append("")
+            emit(f"#### Initializers for `{type_name}`")
+            emit()
 
             # Show usage pattern
             if type_info and type_info.pointer_to:
-                lines.append(f"**Note:** `{type_name}` is a pointer typedef to `struct {underlying_struct}`.")
-                lines.append("")
-            lines.append("**Usage pattern:**")
-            lines.append("```c")
-            lines.append(f"// 1. Allocate the struct on the stack")
-            lines.append(f"struct {underlying_struct} obj;")
-            lines.append("")
-            lines.append(f"// 2. Initialize using one of the functions below")
-            if top_funcs:
-                # Show first initializer as example
-                first_init = top_funcs[0]
-                lines.append(f"// {first_init.name}(&obj, ...);")
-            lines.append("")
-            lines.append(f"// 3. Pass to target function")
-            lines.append(f"// {target.name}(..., &obj, ...);")
-            lines.append("```")
-            lines.append("")
-
-            lines.append("**Available initializer functions:**")
-            lines.append("")
-            lines.append("```c")
+                emit(f"**Note:** `{type_name}` is a pointer typedef to `struct {underlying_struct}`.")
+                emit()
+            # Show first initializer as example
+            example = f"// {top_funcs[0].name}(&obj, ...);\n" if top_funcs else ""
+            write(
+                "**Usage pattern:**\n"
+                "```c\n"
+                "// 1. Allocate the struct on the stack\n"
+                f"struct {underlying_struct} obj;\n"
+                "\n"
+                "// 2. Initialize using one of the functions below\n"
+                f"{example}"
+                "\n"
+                "// 3. Pass to target function\n"
+                f"// {target.name}(..., &obj, ...);\n"
+                "```\n"
+                "\n"
+            )
+
+            write("**Available initializer functions:**\n\n```c\n")
 
             for func in top_funcs:
                 if func.doc_comment:
                     doc_lines = func.doc_comment.strip().split('\n')
                     if len(doc_lines) > 5:
                         doc_lines = doc_lines[:5] + ['...']
-                    lines.append('\n'.join(doc_lines))
+                    emit('\n'.join(doc_lines))
 
                 basename = os.path.basename(func.file_path)
-                lines.append(f"// From {basename}:{func.line_number}")
+                emit(f"// From {basename}:{func.line_number}")
 
-                sig = func.source.split('{')[0].strip() if '{' in func.source else func.source.strip()
-                if not sig.endswith(';'):
-                    sig += ';'
-                lines.append(sig)
-                lines.append("")
+                emit(func.signature)
+                emit()
 
-            lines.append("```")
+            emit("```")
 
             if len(funcs) > 10:
-                lines.append(f"*({len(funcs) - 10} more initializers available)*")
-            lines.append("")
+                emit(f"*({len(funcs) - 10} more initializers available)*")
+            emit()
 
     # ========== EXTERN DECLARATIONS ==========
     if relevant_factories or relevant_initializers:
-        lines.append("### Required Extern Declarations")
-        lines.append("")
-        lines.append("**Copy these declarations into your driver:**")
-        lines.append("")
-        lines.append("```c")
+        write(_EXTERN_HEADER)
+
+        # Collect raw signatures of the top factories and initializers
+        raw_signatures = []
+        for funcs in list(relevant_factories.values()) + list(relevant_initializers.values()):
+            for func in funcs[:5]:
+                if _is_static(func.signature):
+                    continue
+                raw_signatures.append(func.signature)
 
         # Forward declare struct types
         # For pointer typedefs, declare the underlying struct
@@ -394,163 +481,136 @@ def format_context(
         for type_name in types_to_declare:
             type_info = type_defs.get(type_name)
             if type_info and type_info.pointer_to:
-                struct_name = type_info.pointer_to
+                declared_structs.add(type_info.pointer_to)
             else:
-                struct_name = type_name
-            if struct_name not in declared_structs:
-                lines.append(f"struct {struct_name};")
-                declared_structs.add(struct_name)
-        lines.append("")
+                declared_structs.add(type_name)
+        for name in sorted(declared_structs):
+            emit(f"struct {name};")
+        emit()
 
         # Include required type definitions (typedefs, enums used in signatures)
         if required_type_defs:
-            lines.append("// Required type definitions")
+            emit("// Required type definitions")
             for type_name, type_source in required_type_defs.items():
                 source = type_source.strip()
                 if not source.endswith(';'):
                     source += ';'
-                lines.append(source)
-            lines.append("")
-
-        # Collect all function signatures
-        signatures = []
-
-        # Factory signatures
-        for type_name, funcs in relevant_factories.items():
-            for func in funcs[:5]:
-                sig = func.source.split('{')[0].strip() if '{' in func.source else func.source.strip()
-                if not sig.endswith(';'):
-                    sig += ';'
-                if 'static ' in sig:
-                    continue
-                sig = add_struct_keyword_to_signature(sig, declared_structs)
-                if not sig.startswith('extern'):
-                    sig = 'extern ' + sig
-                if sig not in signatures:
-                    signatures.append(sig)
+                emit(source)
+            emit()
 
-        # Initializer signatures
-        for type_name, funcs in relevant_initializers.items():
-            for func in funcs[:5]:
-                sig = func.source.split('{')[0].strip() if '{' in func.source else func.source.strip()
-                if not sig.endswith(';'):
-                    sig += ';'
-                if 'static ' in sig:
-                    continue
-                sig = add_struct_keyword_to_signature(sig, declared_structs)
-                if not sig.startswith('extern'):
-                    sig = 'extern ' + sig
-                if sig not in signatures:
-                    signatures.append(sig)
+        # Function signatures (dict as an insertion-ordered set)
+        signatures: Dict[str, None] = {}
+        for sig in raw_signatures:
+            sig = add_struct_keyword_to_signature(sig, declared_structs)
+            if not sig.startswith('extern'):
+                sig = 'extern ' + sig
+            signatures.setdefault(sig, None)
 
         if signatures:
-            lines.append("// Function declarations")
+            emit("// Function declarations")
             for sig in signatures:
-                lines.append(sig)
+                emit(sig)
 
-        lines.append("```")
-        lines.append("")
+        emit("```")
+        emit()
 
     # Type information
     if type_defs:
-        lines.append("### Type Information")
-        lines.append("```c")
+        emit("### Type Information")
+        emit("```c")
 
         for type_name, type_info in type_defs.items():
             if type_info.source:
                 category_str = type_info.category
                 if type_info.pointer_to:
                     category_str += f" (pointer to struct {type_info.pointer_to})"
-                lines.append(f"// {category_str}: {type_name}")
-                lines.append(type_info.source)
-                lines.append("")
+                emit(f"// {category_str}: {type_name}")
+                emit(type_info.source)
+                emit()
 
-        lines.append("```")
-        lines.append("")
+        emit("```")
+        emit()
 
     # Parameter handling guide
     if target.params:
-        lines.append("### Parameter Initialization Guide")
-        lines.append("")
-        lines.append("| Parameter | Type | Recommended Approach |")
-        lines.append("|-----------|------|---------------------|")
-
-        for param in target.params:
-            category = categorize_type(param.type)
-            normalized = normalize_type(param.type)
-
-            if category == 'struct_ptr' and normalized in factories:
-                factory_names = [f.name for f in factories[normalized][:3]]
-                approach = f"Use `{factory_names[0]}()`" + (f" or similar" if len(factory_names) > 1 else "")
-            elif category == 'struct_ptr' and normalized in initializers:
-                init_names = [f.name for f in initializers[normalized][:3]]
-                type_info = type_defs.get(normalized)
-                underlying = type_info.pointer_to if type_info and type_info.pointer_to else normalized
-                approach = f"Stack-allocate `struct {underlying}`, then `{init_names[0]}()`"
-            elif category == 'string':
-                approach = "`malloc()` + `tis_make_unknown()` + null-terminate"
-            elif category == 'enum':
-                approach = "`tis_interval()` over enum range"
-            elif category == 'primitive':
-                approach = "`tis_int_interval()` or specific value"
-            elif category == 'func_ptr':
-                approach = "`NULL` or stub function"
-            else:
-                approach = "See type definition"
+        write(_PARAM_GUIDE_HEADER)
 
-            lines.append(f"| `{param.name}` | `{param.type}` | {approach} |")
+        if param_categories is None:
+            param_categories = [(p, categorize_type(p.type)) for p in target.params]
 
-        lines.append("")
+        # Approach per struct type, computed once (factories take precedence)
+        struct_approaches: Dict[str, str] = {}
+        for type_name, funcs in initializers.items():
+            type_info = type_defs.get(type_name)
+            underlying = type_info.pointer_to if type_info and type_info.pointer_to else type_name
+            struct_approaches[type_name] = f"Stack-allocate `struct {underlying}`, then `{funcs[0].name}()`"
+        for type_name, funcs in factories.items():
+            struct_approaches[type_name] = f"Use `{funcs[0].name}()`" + (" or similar" if len(funcs) > 1 else "")
 
-    return '\n'.join(lines)
+        for param, category in param_categories:
+            approach = None
+            if category == 'struct_ptr':
+                approach = struct_approaches.get(normalize_type(param.type))
+            if approach is None:
+                approach = _CATEGORY_APPROACHES.get(category, "See type definition")
 
+            emit(f"| `{param.name}` | `{param.type}` | {approach} |")
 
-def get_context_summary(index_path: str, function_name: str) -> Optional[Dict]:
+        emit()
+
+    # emit() terminates every line; the output joins them, so drop the last one
+    return buf.getvalue()[:-1]
+
+
+def get_context_summary(
+    index_path: str,
+    function_name: str,
+    conn: Optional[sqlite3.Connection] = None,
+) -> Optional[Dict]:
     """
     Get a summary of available context for a function.
 
-    Useful for debugging/CLI output.
+    Useful for debugging/CLI output. Uses the shared cached connection for
+    index_path unless conn is given.
     """
-    conn = get_connection(index_path)
-
-    try:
-        target = get_function(conn, function_name)
-        if not target:
-            return None
-
-        # Collect factories
-        factories: Dict[str, List[FunctionInfo]] = {}
-        visited = set()
-
-        for param in target.params:
-            if categorize_type(param.type) == 'struct_ptr':
-                collect_factories_recursive(
-                    conn, param.type, factories, visited,
-                    depth=0, max_depth=1,
-                    target_function_name=function_name,
-                )
-
-        # Collect initializers
-        initializers: Dict[str, List[FunctionInfo]] = {}
-        for param in target.params:
-            if categorize_type(param.type) == 'struct_ptr':
-                normalized = normalize_type(param.type)
-                type_initializers = find_initializers(conn, param.type, function_name)
-                if type_initializers:
-                    initializers[normalized] = type_initializers
-
-        return {
-            "function": target.name,
-            "params": [(p.type, p.name) for p in target.params],
-            "factories": {
-                type_name: [f.name for f in funcs]
-                for type_name, funcs in factories.items()
-            },
-            "initializers": {
-                type_name: [f.name for f in funcs]
-                for type_name, funcs in initializers.items()
-            },
-        }
-
-    finally:
-        conn.close()
+    if conn is None:
+        conn = get_connection_cached(index_path)
+
+    target = get_function(conn, function_name)
+    if not target:
+        return None
+
+    param_types = [
+        p.type for p in target.params
+        if categorize_type(p.type) == 'struct_ptr'
+    ]
+
+    # Collect factories
+    factories: Dict[str, List[FunctionInfo]] = {}
+    visited = set()
+
+    collect_factories(
+        conn, param_types, factories, visited,
+        max_depth=1,
+        target_function_name=function_name,
+    )
+
+    # Collect initializers
+    initializers: Dict[str, List[FunctionInfo]] = {}
+    for normalized in dict.fromkeys(normalize_type(pt) for pt in param_types):
+        type_initializers = find_initializers(conn, normalized, function_name)
+        if type_initializers:
+            initializers[normalized] = type_initializers
+
+    return {
+        "function": target.name,
+        "params": [(p.type, p.name) for p in target.params],
+        "factories": {
+            type_name: [f.name for f in funcs]
+            for type_name, funcs in factories.items()
+        },
+        "initializers": {
+            type_name: [f.name for f in funcs]
+            for type_name, funcs in initializers.items()
+        },
+    }
@@ -1,13 +1,26 @@
 """SQLite index for AST metadata."""
 
 import sqlite3
+import hashlib
 import json
+import mmap
 import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple
 from dataclasses import asdict
 
+try:
+    import orjson
+
+    def _json_dumps(obj) -> str:
+        return orjson.dumps(obj).decode()
+except ImportError:
+    _json_dumps = json.dumps
+
 from .models import FunctionInfo, TypeInfo, Param
+from .lookup import clear_lookup_cache, name_tags
 from .parser import (
     get_parser,
     extract_functions,
@@ -17,7 +30,72 @@ from .parser import (
 )
 
 
-SCHEMA_VERSION = 2
+SCHEMA_VERSION = 8
+
+# Commit the bulk insert transaction every N files
+COMMIT_EVERY_FILES = 1000
+
+# Connection settings for bulk indexing (WAL journal, fewer fsyncs, 64 MiB cache)
+BUILD_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-65536",
+)
+
+INSERT_FUNCTION_SQL = """
+    INSERT INTO functions
+    (name, return_type, return_type_normalized, params_json, param_count,
+     name_tags, file_path, line_number, source, doc_comment)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT(name, file_path) DO UPDATE SET
+        return_type = excluded.return_type,
+        return_type_normalized = excluded.return_type_normalized,
+        params_json = excluded.params_json,
+        param_count = excluded.param_count,
+        name_tags = excluded.name_tags,
+        line_number = excluded.line_number,
+        source = excluded.source,
+        doc_comment = excluded.doc_comment
+"""
+
+# Parameter rows reference their function by (name, file_path)
+INSERT_PARAM_SQL = """
+    INSERT OR REPLACE INTO function_params
+    (function_id, param_index, type_normalized, pointer_depth)
+    SELECT id, ?, ?, ? FROM functions WHERE name = ? AND file_path = ?
+"""
+
+# Rows extracted from one file, removed before it is stored again
+DELETE_FILE_ROWS_SQL = (
+    """
+    DELETE FROM function_params
+    WHERE function_id IN (SELECT id FROM functions WHERE file_path = ?)
+    """,
+    "DELETE FROM functions WHERE file_path = ?",
+    "DELETE FROM types WHERE file_path = ?",
+)
+
+# Content digest of each indexed file, with its row counts for build stats
+# and its position in the list of files of the last build
+INSERT_FILE_SQL = """
+    INSERT OR REPLACE INTO files (path, sha256, functions, types, file_order)
+    VALUES (?, ?, ?, ?, ?)
+"""
+
+# One row per definition: a type defined in several files has a row for
+# each, and lookups resolve its name to the definition from the file
+# listed last (files.file_order), whichever files were reparsed
+INSERT_TYPE_SQL = """
+    INSERT INTO types
+    (name, category, enum_values_json, file_path, source, pointer_to)
+    VALUES (?, ?, ?, ?, ?, ?)
+    ON CONFLICT(name, file_path) DO UPDATE SET
+        category = excluded.category,
+        enum_values_json = excluded.enum_values_json,
+        source = excluded.source,
+        pointer_to = excluded.pointer_to
+"""
 
 SCHEMA = """
 CREATE TABLE IF NOT EXISTS functions (
@@ -26,6 +104,8 @@ CREATE TABLE IF NOT EXISTS functions (
     return_type TEXT NOT NULL,
     return_type_normalized TEXT NOT NULL,
     params_json TEXT,
+    param_count INTEGER NOT NULL DEFAULT 0,
+    name_tags INTEGER NOT NULL DEFAULT 0,
     file_path TEXT NOT NULL,
     line_number INTEGER,
     source TEXT,
@@ -35,20 +115,40 @@ CREATE TABLE IF NOT EXISTS functions (
 
 CREATE INDEX IF NOT EXISTS idx_return_type ON functions(return_type_normalized);
 CREATE INDEX IF NOT EXISTS idx_name ON functions(name);
+CREATE INDEX IF NOT EXISTS idx_name_nocase ON functions(name COLLATE NOCASE);
+
+CREATE TABLE IF NOT EXISTS function_params (
+    function_id INTEGER NOT NULL REFERENCES functions(id),
+    param_index INTEGER NOT NULL,
+    type_normalized TEXT NOT NULL,
+    pointer_depth INTEGER NOT NULL,
+    PRIMARY KEY (function_id, param_index)
+);
+
+CREATE INDEX IF NOT EXISTS idx_fp_type ON function_params(type_normalized, pointer_depth, function_id);
 
 CREATE TABLE IF NOT EXISTS types (
     id INTEGER PRIMARY KEY,
-    name TEXT NOT NULL UNIQUE,
+    name TEXT NOT NULL,
     category TEXT NOT NULL,
     enum_values_json TEXT,
     file_path TEXT,
     source TEXT,
-    pointer_to TEXT
+    pointer_to TEXT,
+    UNIQUE(name, file_path)
 );
 
 CREATE INDEX IF NOT EXISTS idx_type_name ON types(name);
 CREATE INDEX IF NOT EXISTS idx_type_category ON types(category);
 
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY,
+    sha256 BLOB NOT NULL,
+    functions INTEGER NOT NULL,
+    types INTEGER NOT NULL,
+    file_order INTEGER NOT NULL DEFAULT 0
+);
+
 CREATE TABLE IF NOT EXISTS meta (
     key TEXT PRIMARY KEY,
     value TEXT
@@ -56,6 +156,14 @@ CREATE TABLE IF NOT EXISTS meta (
 """
 
 
+def _param_keys(params) -> List[Tuple[int, str, int]]:
+    """(index, normalized type, pointer depth) of each parameter, for function_params."""
+    return [
+        (index, normalize_type(param.type), param.type.count('*'))
+        for index, param in enumerate(params)
+    ]
+
+
 def _migrate_schema(conn: sqlite3.Connection, current_version: int) -> None:
     """Migrate database schema from older versions."""
     if current_version < 2:
@@ -67,6 +175,69 @@ def _migrate_schema(conn: sqlite3.Connection, current_version: int) -> None:
             # Column already exists
             pass
 
+    if current_version < 3:
+        # Fill function_params from the params stored with each function
+        rows = conn.execute("SELECT id, params_json FROM functions").fetchall()
+        conn.executemany(
+            "INSERT OR REPLACE INTO function_params VALUES (?, ?, ?, ?)",
+            (
+                (function_id, index, type_normalized, pointer_depth)
+                for function_id, params_json in rows
+                for index, type_normalized, pointer_depth in _param_keys(
+                    Param(**p) for p in json.loads(params_json or '[]')
+                )
+            ),
+        )
+        conn.commit()
+
+    if current_version < 4:
+        # Add param_count column to functions table
+        try:
+            conn.execute(
+                "ALTER TABLE functions ADD COLUMN param_count INTEGER NOT NULL DEFAULT 0"
+            )
+        except sqlite3.OperationalError:
+            # Column already exists
+            pass
+        conn.execute("""
+            UPDATE functions SET param_count = (
+                SELECT COUNT(*) FROM function_params WHERE function_id = functions.id
+            )
+        """)
+        conn.commit()
+
+    if current_version < 5:
+        # Add name_tags column to functions table
+        try:
+            conn.execute(
+                "ALTER TABLE functions ADD COLUMN name_tags INTEGER NOT NULL DEFAULT 0"
+            )
+        except sqlite3.OperationalError:
+            # Column already exists
+            pass
+        conn.create_function("name_tags", 1, name_tags, deterministic=True)
+        conn.execute("UPDATE functions SET name_tags = name_tags(name)")
+        conn.commit()
+
+    if current_version < 7:
+        # Types were unique by name: recreate the table keyed by
+        # (name, file_path). Every file is reparsed after a migration,
+        # which fills it again.
+        conn.execute("DROP TABLE types")
+        conn.executescript(SCHEMA)
+        conn.commit()
+
+    if current_version < 8:
+        # Add file_order column to files table
+        try:
+            conn.execute(
+                "ALTER TABLE files ADD COLUMN file_order INTEGER NOT NULL DEFAULT 0"
+            )
+        except sqlite3.OperationalError:
+            # Column already exists
+            pass
+        conn.commit()
+
 
 def _create_schema(conn: sqlite3.Connection) -> None:
     """Create database schema, with migration support."""
@@ -85,6 +256,9 @@ def _create_schema(conn: sqlite3.Connection) -> None:
     # Run migrations if needed
     if current_version < SCHEMA_VERSION:
         _migrate_schema(conn, current_version)
+        # Rows stored by an older version may lack what the new one
+        # extracts: reparse every file on the next build
+        conn.execute("DELETE FROM files")
 
     conn.execute(
         "INSERT OR REPLACE INTO meta VALUES ('schema_version', ?)",
@@ -93,20 +267,168 @@ def _create_schema(conn: sqlite3.Connection) -> None:
     conn.commit()
 
 
+# Process pool parsing only pays off above this many files
+PARALLEL_MIN_FILES = 32
+
+# Parse jobs queued per pool worker while building
+PARSE_JOBS_PER_WORKER = 2
+
+# Parser of the current process (tree-sitter parsers are not picklable)
+_process_parser = None
+
+
+def _get_process_parser():
+    """Get the tree-sitter parser for the current process, creating it once."""
+    global _process_parser
+    if _process_parser is None:
+        _process_parser = get_parser()
+    return _process_parser
+
+
+def _parse_file(file_path: str, content) -> Tuple[List[tuple], List[tuple], List[tuple]]:
+    """
+    Parse one source file into rows for the functions, types and function_params tables.
+
+    content may be bytes or any read-only buffer such as an mmap. Runs in
+    worker processes, so it returns plain tuples.
+    """
+    tree = _get_process_parser().parse(content)
+    functions = extract_functions(tree, file_path, content)
+
+    func_rows = [
+        (
+            func.name,
+            func.return_type,
+            normalize_type(func.return_type),
+            _json_dumps([asdict(p) for p in func.params]),
+            len(func.params),
+            name_tags(func.name),
+            func.file_path,
+            func.line_number,
+            func.source,
+            func.doc_comment,
+        )
+        for func in functions
+    ]
+
+    param_rows = [
+        (index, type_normalized, pointer_depth, func.name, func.file_path)
+        for func in functions
+        for index, type_normalized, pointer_depth in _param_keys(func.params)
+    ]
+
+    type_rows = [
+        (
+            type_info.name,
+            type_info.category,
+            _json_dumps(type_info.enum_values),
+            type_info.file_path,
+            type_info.source,
+            type_info.pointer_to,
+        )
+        for type_info in extract_types(tree, file_path, content)
+    ]
+
+    return func_rows, type_rows, param_rows
+
+
+def _parse_content(
+    file_path: str,
+    content,
+    known_digest: Optional[bytes] = None,
+) -> Tuple[bytes, Optional[Tuple[List[tuple], List[tuple], List[tuple]]]]:
+    """
+    Hash and parse a source file's content.
+
+    Returns (sha256 digest, rows as from _parse_file); rows are None when
+    the digest equals known_digest, i.e. the file is unchanged since it
+    was last indexed.
+    """
+    digest = hashlib.sha256(content).digest()
+    if digest == known_digest:
+        return digest, None
+    return digest, _parse_file(file_path, content)
+
+
+def _parse_local_file(file_path: str, known_digest: Optional[bytes] = None):
+    """
+    Hash and parse a local source file (see _parse_content), memory-mapping
+    it instead of reading a copy.
+
+    Returns None if the file is empty or can't be read.
+    """
+    try:
+        with open(file_path, 'rb') as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return None
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as content:
+                return _parse_content(file_path, content, known_digest)
+    except OSError:
+        # Skip files we can't read
+        return None
+
+
+def _read_remote_file(file_path: str, tis_runner) -> Optional[bytes]:
+    """Read a source file through the TIS runner; None if unreadable."""
+    try:
+        content = tis_runner.read_remote_file(file_path)
+        if isinstance(content, str):
+            content = content.encode('utf-8')
+        return content
+    except Exception:
+        # Skip files we can't read
+        return None
+
+
+def _delete_file_rows(conn: sqlite3.Connection, file_path: str) -> None:
+    """Delete the function, parameter and type rows extracted from a file."""
+    for sql in DELETE_FILE_ROWS_SQL:
+        conn.execute(sql, (file_path,))
+
+
+def _submit_parse(executor, file_path: str, known_digest: Optional[bytes], tis_runner=None):
+    """
+    Queue a file for parsing in the pool.
+
+    Remote files (tis_runner given) are read on the calling thread first;
+    returns None if one can't be read.
+    """
+    if tis_runner is None:
+        return executor.submit(_parse_local_file, file_path, known_digest)
+    content = _read_remote_file(file_path, tis_runner)
+    if not content:
+        return None
+    return executor.submit(_parse_content, file_path, content, known_digest)
+
+
 def build_index(
     files: List[Any],  # List of FileInfo from compilation_db
     db_path: str,
     tis_runner=None,
     progress_callback=None,
+    workers: Optional[int] = None,
+    incremental: bool = True,
 ) -> Dict[str, int]:
     """
     Build AST index from source files.
 
+    Parsing runs in a process pool when there are at least
+    PARALLEL_MIN_FILES files; local files are memory-mapped by the process
+    that parses them, remote files are read on the calling thread. All
+    SQLite writes stay on the calling thread.
+
+    When updating an existing index, files whose content (SHA-256) is the
+    same as when they were last indexed are not parsed again; their rows
+    are kept as they are. A reparsed file's old rows are replaced, and
+    rows of files no longer in files are removed.
+
     Args:
         files: List of FileInfo objects with .path attribute
         db_path: Path to SQLite database
         tis_runner: Optional TIS runner for remote file access
         progress_callback: Optional callback(current, total, file_path)
+        workers: Number of parser processes (default: CPU count, 1 disables the pool)
+        incremental: Skip unchanged files (False reparses every file)
 
     Returns:
         Dict with stats: {"functions": N, "types": N, "files": N}
@@ -117,7 +439,7 @@ def build_index(
             "Install with: pip install tree-sitter tree-sitter-c"
         )
 
-    parser = get_parser()
+    parser = _get_process_parser()
     if not parser:
         raise RuntimeError("Failed to create tree-sitter parser")
 
@@ -127,78 +449,115 @@ def build_index(
         os.makedirs(db_dir, exist_ok=True)
 
     conn = sqlite3.connect(db_path)
+    for pragma in BUILD_PRAGMAS:
+        conn.execute(pragma)
     _create_schema(conn)
 
     stats = {"functions": 0, "types": 0, "files": 0}
-    total_files = len(files)
+    file_paths = [
+        file_info.path if hasattr(file_info, 'path') else str(file_info)
+        for file_info in files
+    ]
+    total_files = len(file_paths)
+
+    # Digest and row counts of the files indexed by previous builds
+    known_files = {}
+    if incremental:
+        known_files = {
+            path: (digest, func_count, type_count)
+            for path, digest, func_count, type_count in conn.execute(
+                "SELECT path, sha256, functions, types FROM files"
+            )
+        }
 
-    for i, file_info in enumerate(files):
-        file_path = file_info.path if hasattr(file_info, 'path') else str(file_info)
+    if workers is None:
+        workers = os.cpu_count() or 1
+    executor = None
+    if workers > 1 and total_files >= PARALLEL_MIN_FILES:
+        executor = ProcessPoolExecutor(max_workers=workers)
 
-        if progress_callback:
-            progress_callback(i + 1, total_files, file_path)
+    # Local files are memory-mapped where they are parsed; remote files
+    # are read on the calling thread
+    remote = tis_runner is not None and hasattr(tis_runner, 'read_remote_file')
 
-        # Read file content
-        try:
-            if tis_runner and hasattr(tis_runner, 'read_remote_file'):
-                content = tis_runner.read_remote_file(file_path)
-                if isinstance(content, str):
-                    content = content.encode('utf-8')
+    try:
+        # With a pool, parse jobs queued ahead of the file being stored, in
+        # file order. Bounded so remote reads overlap parsing without the
+        # whole source tree waiting in the executor queue.
+        jobs = deque()
+        queued = 0
+        max_queued = workers * PARSE_JOBS_PER_WORKER
+
+        # Store results in file order
+        for i, file_path in enumerate(file_paths):
+            if progress_callback:
+                progress_callback(i + 1, total_files, file_path)
+
+            known_digest = known_files.get(file_path, (None,))[0]
+            if executor:
+                while queued < total_files and queued - i < max_queued:
+                    queued_path = file_paths[queued]
+                    jobs.append(_submit_parse(
+                        executor,
+                        queued_path,
+                        known_files.get(queued_path, (None,))[0],
+                        tis_runner if remote else None,
+                    ))
+                    queued += 1
+                job = jobs.popleft()
+                result = job.result() if job else None
+            elif remote:
+                content = _read_remote_file(file_path, tis_runner)
+                result = _parse_content(file_path, content, known_digest) if content else None
             else:
-                with open(file_path, 'rb') as f:
-                    content = f.read()
-        except Exception as e:
-            # Skip files we can't read
-            continue
-
-        if not content:
-            continue
-
-        # Parse with tree-sitter
-        tree = parser.parse(content)
-
-        # Extract and store functions
-        for func in extract_functions(tree, file_path, content):
-            try:
-                conn.execute("""
-                    INSERT OR REPLACE INTO functions
-                    (name, return_type, return_type_normalized, params_json,
-                     file_path, line_number, source, doc_comment)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-                """, (
-                    func.name,
-                    func.return_type,
-                    normalize_type(func.return_type),
-                    json.dumps([asdict(p) for p in func.params]),
-                    func.file_path,
-                    func.line_number,
-                    func.source,
-                    func.doc_comment,
-                ))
-                stats["functions"] += 1
-            except sqlite3.IntegrityError:
-                pass  # Duplicate, skip
-
-        # Extract and store types
-        for type_info in extract_types(tree, file_path, content):
-            try:
-                conn.execute("""
-                    INSERT OR REPLACE INTO types
-                    (name, category, enum_values_json, file_path, source, pointer_to)
-                    VALUES (?, ?, ?, ?, ?, ?)
-                """, (
-                    type_info.name,
-                    type_info.category,
-                    json.dumps(type_info.enum_values),
-                    type_info.file_path,
-                    type_info.source,
-                    type_info.pointer_to,
-                ))
-                stats["types"] += 1
-            except sqlite3.IntegrityError:
-                pass
-
-        stats["files"] += 1
+                result = _parse_local_file(file_path, known_digest)
+            if result is None:
+                continue
+            digest, parsed = result
+
+            if parsed is None:
+                # Unchanged since the last build: keep its rows
+                _, func_count, type_count = known_files[file_path]
+                conn.execute(
+                    "UPDATE files SET file_order = ? WHERE path = ?", (i, file_path)
+                )
+            else:
+                func_rows, type_rows, param_rows = parsed
+
+                # Drop what the file held before, including definitions it
+                # no longer has
+                _delete_file_rows(conn, file_path)
+                conn.executemany(INSERT_FUNCTION_SQL, func_rows)
+                conn.executemany(INSERT_PARAM_SQL, param_rows)
+                conn.executemany(INSERT_TYPE_SQL, type_rows)
+
+                func_count, type_count = len(func_rows), len(type_rows)
+                conn.execute(
+                    INSERT_FILE_SQL, (file_path, digest, func_count, type_count, i)
+                )
+
+            stats["functions"] += func_count
+            stats["types"] += type_count
+            stats["files"] += 1
+
+            # Checkpoint the transaction periodically on very large codebases
+            if stats["files"] % COMMIT_EVERY_FILES == 0:
+                conn.commit()
+    finally:
+        if executor:
+            executor.shutdown(cancel_futures=True)
+
+    # Drop files indexed by earlier builds that are no longer listed
+    indexed_paths = {
+        path for (path,) in conn.execute(
+            "SELECT file_path FROM functions UNION SELECT file_path FROM types "
+            "UNION SELECT path FROM files"
+        )
+        if path is not None
+    }
+    for file_path in indexed_paths.difference(file_paths):
+        _delete_file_rows(conn, file_path)
+        conn.execute("DELETE FROM files WHERE path = ?", (file_path,))
 
     # Store metadata
     conn.execute(
@@ -211,8 +570,14 @@ def build_index(
     )
 
     conn.commit()
+
+    # Gather index statistics for the query planner
+    conn.execute("ANALYZE")
     conn.close()
 
+    # Memoized lookups on cached connections may describe the old index
+    clear_lookup_cache()
+
     return stats
 
 
@@ -225,7 +590,7 @@ def get_index_stats(db_path: str) -> Optional[Dict[str, Any]]:
 
     try:
         func_count = conn.execute("SELECT COUNT(*) FROM functions").fetchone()[0]
-        type_count = conn.execute("SELECT COUNT(*) FROM types").fetchone()[0]
+        type_count = conn.execute("SELECT COUNT(DISTINCT name) FROM types").fetchone()[0]
 
         meta = {}
         for row in conn.execute("SELECT key, value FROM meta"):
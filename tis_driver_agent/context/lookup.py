@@ -1,93 +1,266 @@
 """Database lookup functions for factory discovery."""
 
+import copy
+import heapq
+import re
 import sqlite3
-from typing import List, Optional, Set
+import threading
+from functools import lru_cache
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
 import os
 
 from .models import FunctionInfo, TypeInfo
 from .parser import normalize_type, categorize_type
 
 
-def get_connection(db_path: str) -> sqlite3.Connection:
-    """Get a database connection."""
+# Stay below SQLITE_MAX_VARIABLE_NUMBER on older SQLite builds (999)
+_MAX_IN_PARAMS = 500
+
+
+# Connection settings for lookups (32 MiB page cache, memory-mapped reads)
+LOOKUP_PRAGMAS = (
+    "PRAGMA cache_size=-32768",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA mmap_size=268435456",
+)
+
+
+class IndexOutdatedError(RuntimeError):
+    """The index was built with an older schema; 'reindex --full' rebuilds it."""
+
+
+def _schema_version(conn: sqlite3.Connection) -> int:
+    """Schema version recorded in an index (0 if none)."""
+    try:
+        row = conn.execute(
+            "SELECT value FROM meta WHERE key = 'schema_version'"
+        ).fetchone()
+    except sqlite3.OperationalError:
+        return 0
+    return int(row[0]) if row else 0
+
+
+def _open_index(db_path: str, **connect_kwargs) -> sqlite3.Connection:
+    """Open an index for lookups; it must already be at SCHEMA_VERSION."""
+    # Imported here: index.py imports this module
+    from .index import SCHEMA_VERSION
+
     if not os.path.exists(db_path):
         raise FileNotFoundError(f"Index not found: {db_path}")
-    return sqlite3.connect(db_path)
+    conn = sqlite3.connect(db_path, **connect_kwargs)
+    # Lookups never write: migrations only run from build_index (reindex)
+    if _schema_version(conn) < SCHEMA_VERSION:
+        conn.close()
+        raise IndexOutdatedError(
+            f"Index {db_path} predates schema v{SCHEMA_VERSION}, "
+            "run 'tischiron reindex --full <project>' to rebuild it"
+        )
+    for pragma in LOOKUP_PRAGMAS:
+        conn.execute(pragma)
+    return conn
 
 
-def get_function(conn: sqlite3.Connection, name: str) -> Optional[FunctionInfo]:
+def get_connection(db_path: str) -> sqlite3.Connection:
+    """Get a database connection."""
+    return _open_index(db_path)
+
+
+# Read-only connections shared across calls, keyed by (thread id, database path)
+_cached_connections: Dict[Tuple[int, str], sqlite3.Connection] = {}
+
+# Memoized lookup results of each cached connection. Only connections
+# opened by get_connection_cached() are memoized: they are read-only and
+# owned by this module, so entries can't outlive or alias them.
+_lookup_memos: Dict[sqlite3.Connection, Dict[tuple, object]] = {}
+
+# Max memoized results per connection (oldest are dropped first)
+LOOKUP_MEMO_SIZE = 4096
+
+
+def get_connection_cached(db_path: str) -> sqlite3.Connection:
     """
-    Get a function by name.
+    Get a long-lived read-only connection for a database, opening it once
+    per thread.
 
-    Returns the version with body (from .c file), enriched with doc comment
-    from header if available.
+    The connection is shared by every caller in the calling thread, and
+    sqlite3 refuses its use from any other thread. Do not close it
+    directly, use close_all_connections() instead.
     """
-    # Get all versions
-    rows = conn.execute("""
-        SELECT name, return_type, params_json, file_path, line_number, source, doc_comment
-        FROM functions
-        WHERE name = ?
-    """, (name,)).fetchall()
+    path = os.path.abspath(db_path)
+    key = (threading.get_ident(), path)
+    conn = _cached_connections.get(key)
+    if conn is None:
+        conn = _open_index(path)
+        conn.execute("PRAGMA query_only=ON")
+        _cached_connections[key] = conn
+        _lookup_memos[conn] = {}
+    return conn
+
+
+def close_all_connections() -> None:
+    """
+    Forget every connection opened by get_connection_cached().
 
-    if not rows:
-        return None
+    Those of the calling thread are closed; sqlite3 closes the others
+    once they are no longer referenced.
+    """
+    thread_id = threading.get_ident()
+    while _cached_connections:
+        (owner, _), conn = _cached_connections.popitem()
+        _lookup_memos.pop(conn, None)
+        if owner == thread_id:
+            conn.close()
+
+
+def clear_lookup_cache() -> None:
+    """Forget memoized lookup results (e.g. after an index was rebuilt)."""
+    for memo in _lookup_memos.values():
+        memo.clear()
+
+
+def _memo_store(memo: Dict[tuple, object], key: tuple, value) -> None:
+    """Store a copy of a lookup result, dropping the oldest one when the memo is full."""
+    if len(memo) >= LOOKUP_MEMO_SIZE:
+        memo.pop(next(iter(memo), None), None)
+    memo[key] = copy.deepcopy(value)
+
+
+def _memo_get(memo: Dict[tuple, object], key: tuple):
+    """Return a copy of a memoized lookup result, which the caller may modify."""
+    return copy.deepcopy(memo[key])
+
+
+# Best version of a function by name: the first one with a body (from a
+# .c file), else the first documented one, else the first one. A missing
+# doc comment is filled in from the first documented version (header).
+_GET_FUNCTION_SQL = """
+    SELECT f.name, f.return_type, f.params_json, f.file_path, f.line_number,
+           f.source,
+           CASE WHEN COALESCE(f.doc_comment, '') != '' THEN f.doc_comment
+                ELSE (SELECT d.doc_comment FROM functions d
+                      WHERE d.name = f.name AND COALESCE(d.doc_comment, '') != ''
+                      ORDER BY d.id LIMIT 1)
+           END
+    FROM functions f
+    WHERE f.name = ?
+    ORDER BY CASE WHEN instr(f.source, '{') > 0 THEN 0
+                  WHEN COALESCE(f.doc_comment, '') != '' THEN 1
+                  ELSE 2 END,
+             f.id
+    LIMIT 1
+"""
 
-    # Find version with body and version with doc comment
-    with_body = None
-    with_doc = None
 
-    for row in rows:
-        func = FunctionInfo.from_row(row)
-        if '{' in func.source and with_body is None:
-            with_body = func
-        if func.doc_comment and with_doc is None:
-            with_doc = func
-
-    # Prefer version with body, enriched with doc comment
-    if with_body:
-        if with_doc and not with_body.doc_comment:
-            # Merge doc comment from header into the .c version
-            with_body = FunctionInfo(
-                name=with_body.name,
-                return_type=with_body.return_type,
-                params=with_body.params,
-                file_path=with_body.file_path,
-                line_number=with_body.line_number,
-                source=with_body.source,
-                doc_comment=with_doc.doc_comment,
-            )
-        return with_body
-
-    # Fall back to version with doc comment
-    if with_doc:
-        return with_doc
-
-    # Fall back to first version
-    return FunctionInfo.from_row(rows[0])
-
-
-def _is_initializer_pattern(func_name: str) -> bool:
+def get_function(conn: sqlite3.Connection, name: str) -> Optional[FunctionInfo]:
     """
-    Check if a function name suggests it's an initializer.
+    Get a function by name.
 
-    Initializers are functions that populate/configure pre-allocated memory.
-    They take T* as parameter and return int (error code) or void.
+    Returns the version with body (from .c file), enriched with doc comment
+    from header if available. The choice and merge happen in one query.
     """
-    name_lower = func_name.lower()
-
-    # Initializer naming patterns
-    initializer_patterns = (
-        '_init',      # tc_sha256_init, json_object_init
-        '_set_',      # tc_aes128_set_encrypt_key, tc_hmac_set_key
-        '_setup',     # ssl_setup
-        '_configure', # ctx_configure
-        '_begin',     # hash_begin
-        '_start',     # session_start
-        '_reset',     # state_reset
-        '_clear',     # buffer_clear (when used to initialize)
-    )
-
-    return any(pat in name_lower for pat in initializer_patterns)
+    row = conn.execute(_GET_FUNCTION_SQL, (name,)).fetchone()
+    return FunctionInfo.from_row(row) if row else None
+
+
+# Initializer naming patterns
+_INITIALIZER_NAME_PATTERNS = (
+    '_init',      # tc_sha256_init, json_object_init
+    '_set_',      # tc_aes128_set_encrypt_key, tc_hmac_set_key
+    '_setup',     # ssl_setup
+    '_configure', # ctx_configure
+    '_begin',     # hash_begin
+    '_start',     # session_start
+    '_reset',     # state_reset
+    '_clear',     # buffer_clear (when used to initialize)
+)
+
+# Naming patterns of getters/ref-counters
+_GETTER_NAME_PATTERNS = ('_get', '_peek', '_iter', '_ref', '_unref', '_put')
+
+# Naming patterns of destructors/cleanup functions
+_DESTRUCTOR_NAME_PATTERNS = (
+    '_free', '_destroy', '_release', '_cleanup', '_close',
+    '_finish', '_final', '_done', '_end', '_deinit',
+)
+
+# Naming patterns of update/process functions (need initialized state)
+_UPDATE_NAME_PATTERNS = ('_update', '_process', '_step', '_feed', '_write', '_read')
+
+# Semantically opposite pairs: (target_pattern, factory_pattern_to_exclude)
+_OPPOSITE_PAIRS = (
+    # Serialization vs deserialization
+    ('_to_string', '_parse'),
+    ('_to_json', '_parse'),
+    ('_serialize', '_parse'),
+    ('_serialize', '_deserialize'),
+    ('_encode', '_decode'),
+    ('_stringify', '_parse'),
+    # Getters vs setters (for factories, we usually want constructors not setters)
+    ('_get_', '_set_'),
+    # Read vs write
+    ('_read', '_write'),
+    ('_load', '_save'),
+    # Pack vs unpack
+    ('_pack', '_unpack'),
+)
+
+
+def _name_pattern_re(patterns) -> "re.Pattern":
+    """Compile substring patterns into one regex, so a name is scanned once."""
+    return re.compile('|'.join(map(re.escape, patterns)))
+
+
+_INITIALIZER_NAME_RE = _name_pattern_re(_INITIALIZER_NAME_PATTERNS)
+_GETTER_NAME_RE = _name_pattern_re(_GETTER_NAME_PATTERNS)
+_DESTRUCTOR_NAME_RE = _name_pattern_re(_DESTRUCTOR_NAME_PATTERNS)
+_UPDATE_NAME_RE = _name_pattern_re(_UPDATE_NAME_PATTERNS)
+
+# Bits of the functions.name_tags column: which naming patterns a function
+# name matches, computed once at index time so queries test a bit mask
+# instead of re-matching the name
+NAME_TAG_INITIALIZER = 1
+NAME_TAG_GETTER = 2
+NAME_TAG_DESTRUCTOR = 4
+NAME_TAG_UPDATE = 8
+
+_NAME_TAG_RES = (
+    (NAME_TAG_INITIALIZER, _INITIALIZER_NAME_RE),
+    (NAME_TAG_GETTER, _GETTER_NAME_RE),
+    (NAME_TAG_DESTRUCTOR, _DESTRUCTOR_NAME_RE),
+    (NAME_TAG_UPDATE, _UPDATE_NAME_RE),
+)
+
+
+def name_tags(func_name: str) -> int:
+    """Compute the name_tags bit mask of a function name."""
+    name = func_name.lower()
+    tags = 0
+    for tag, pattern in _NAME_TAG_RES:
+        if pattern.search(name):
+            tags |= tag
+    return tags
+
+
+# Getters/ref-counters by name, except initializers (see _is_getter_or_ref_counter)
+_SQL_NOT_GETTER_NAME = (
+    f'(f.name_tags & {NAME_TAG_GETTER | NAME_TAG_INITIALIZER}) != {NAME_TAG_GETTER}'
+)
+
+# Factory score, higher = more likely a true constructor: naming pattern
+# (foo_new best), few required params (easier to call), documented
+_SQL_FACTORY_SCORE = r"""
+    (CASE WHEN f.name LIKE '%\_new\_%' ESCAPE '\' OR f.name LIKE '%\_new' ESCAPE '\' THEN 100
+          WHEN f.name LIKE '%\_new%' ESCAPE '\' THEN 90
+          WHEN f.name LIKE '%\_create%' ESCAPE '\' THEN 80
+          WHEN f.name LIKE '%\_alloc%' ESCAPE '\' THEN 70
+          WHEN f.name LIKE '%\_parse%' ESCAPE '\' OR f.name LIKE '%\_from\_%' ESCAPE '\' THEN 60
+          WHEN f.name LIKE '%\_init%' ESCAPE '\' THEN 50
+          ELSE 0 END
+     + CASE WHEN f.param_count = 0 THEN 20
+            WHEN f.param_count <= 2 THEN 10
+            ELSE 0 END
+     + CASE WHEN f.doc_comment IS NOT NULL AND f.doc_comment != '' THEN 5 ELSE 0 END)
+"""
 
 
 def _is_getter_or_ref_counter(func: FunctionInfo, target_type_normalized: str) -> bool:
@@ -99,17 +272,18 @@ def _is_getter_or_ref_counter(func: FunctionInfo, target_type_normalized: str) -
     - Name contains 'get', 'iter', 'peek', 'ref', 'unref'
 
     Exception: Initializer functions that take the type are NOT getters.
-    """
-    name_lower = func.name.lower()
 
+    Factory queries already drop getters by name (_SQL_NOT_GETTER_NAME);
+    this check is still needed for the signature test.
+    """
     # EXCEPTION: Initializers that take the type are NOT getters
     # They're functions that populate pre-allocated memory
-    if _is_initializer_pattern(func.name):
+    name = func.name_lower
+    if _INITIALIZER_NAME_RE.search(name):
         return False
 
     # Check if name suggests getter/ref behavior
-    getter_patterns = ('_get', '_peek', '_iter', '_ref', '_unref', '_put')
-    if any(pat in name_lower for pat in getter_patterns):
+    if _GETTER_NAME_RE.search(name):
         return True
 
     # Check if it takes the target type as input AND returns it (signature of getter)
@@ -127,87 +301,193 @@ def _is_getter_or_ref_counter(func: FunctionInfo, target_type_normalized: str) -
     return False
 
 
-def _score_factory(func: FunctionInfo) -> int:
+def _opposite_factory_re(target_name: Optional[str]) -> Optional["re.Pattern"]:
     """
-    Score a factory function by how likely it is to be a true constructor.
+    Classify the target function once and return a regex matching factory
+    names that are semantically opposite to it, or None if nothing is excluded.
+
+    For example:
+    - Target is *_to_string* (serialization) → exclude *_parse* (deserialization)
+    - Target is *_get_* (getter) → exclude *_set_* (setter)
+    - Target is *_read* → exclude *_write*
+    - Target is *_encode* → exclude *_decode*
 
-    Higher score = more likely to be a constructor.
+    Callers search candidate names (lowercased) with the returned regex, so
+    the pattern pairs are scanned once per lookup instead of per candidate.
     """
-    name = func.name.lower()
-    score = 0
+    if not target_name:
+        return None
+    return _excluded_factory_re(target_name.lower())
 
-    # Naming patterns (higher = better constructor)
-    if '_new_' in name or name.endswith('_new'):
-        score += 100  # Best: foo_new, foo_new_bar
-    elif '_new' in name:
-        score += 90
-    elif '_create' in name:
-        score += 80
-    elif '_alloc' in name:
-        score += 70
-    elif '_parse' in name or '_from_' in name:
-        score += 60  # Parsers/converters
-    elif '_init' in name:
-        score += 50
-
-    # Penalize functions with many required params (harder to use)
-    if len(func.params) == 0:
-        score += 20  # No params = easy to call
-    elif len(func.params) <= 2:
-        score += 10
 
-    # Bonus for documented functions
-    if func.doc_comment:
-        score += 5
+@lru_cache(maxsize=1024)
+def _excluded_factory_re(target_lower: str) -> Optional["re.Pattern"]:
+    """Regex of the factory patterns opposite to a target name, or None if none apply."""
+    patterns = [
+        factory_pattern for target_pattern, factory_pattern in _OPPOSITE_PAIRS
+        if target_pattern in target_lower
+    ]
+    return _name_pattern_re(patterns) if patterns else None
 
-    return score
+
+def _unique_by_name(rows: Iterable[Tuple[tuple, int]]) -> Iterator[Tuple[FunctionInfo, int]]:
+    """Yield (FunctionInfo, score) for the first row of each function name."""
+    seen = set()
+    for row, score in rows:
+        if row[0] not in seen:
+            seen.add(row[0])
+            yield FunctionInfo.from_row(row), score
 
 
-def _is_semantically_opposite(factory_name: str, target_name: str) -> bool:
+def _rank_factories(
+    rows: Iterable[Tuple[tuple, int]],
+    normalized: str,
+    target_function_name: Optional[str],
+    limit: Optional[int] = None,
+) -> List[FunctionInfo]:
     """
-    Check if a factory function is semantically opposite to the target function.
+    Deduplicate, filter and sort scored factory candidate rows for one type.
 
-    For example:
-    - Target is *_to_string* (serialization) → exclude *_parse* (deserialization)
-    - Target is *_get_* (getter) → exclude *_set_* (setter)
-    - Target is *_read* → exclude *_write*
-    - Target is *_encode* → exclude *_decode*
+    Rows are (function_row, score) pairs, with the score computed in SQL
+    (_SQL_FACTORY_SCORE). They must be ordered by preference: the first
+    row seen for a name wins. Rows are consumed as a stream; with a limit,
+    only the best `limit` candidates are kept (ties keep row order).
     """
-    if not target_name:
-        return False
+    excluded = _opposite_factory_re(target_function_name)
+
+    # Deduplicate by name - keep first occurrence (which has doc_comment if available),
+    # then filter out getters/ref-counters and semantically opposite factories
+    results = (
+        (func, score) for func, score in _unique_by_name(rows)
+        if not _is_getter_or_ref_counter(func, normalized)
+        and (excluded is None or not excluded.search(func.name_lower))
+    )
 
-    factory_lower = factory_name.lower()
-    target_lower = target_name.lower()
-
-    # Define opposite pairs: (target_pattern, factory_pattern_to_exclude)
-    opposite_pairs = [
-        # Serialization vs deserialization
-        ('_to_string', '_parse'),
-        ('_to_json', '_parse'),
-        ('_serialize', '_parse'),
-        ('_serialize', '_deserialize'),
-        ('_encode', '_decode'),
-        ('_stringify', '_parse'),
-        # Getters vs setters (for factories, we usually want constructors not setters)
-        ('_get_', '_set_'),
-        # Read vs write
-        ('_read', '_write'),
-        ('_load', '_save'),
-        # Pack vs unpack
-        ('_pack', '_unpack'),
-    ]
+    # Sort by score descending
+    if limit is not None:
+        ranked = heapq.nsmallest(limit, results, key=lambda x: -x[1])
+    else:
+        ranked = sorted(results, key=lambda x: x[1], reverse=True)
 
-    for target_pattern, factory_pattern in opposite_pairs:
-        if target_pattern in target_lower and factory_pattern in factory_lower:
-            return True
+    return [func for func, _ in ranked]
 
-    return False
+
+@lru_cache(maxsize=None)
+def _factory_query(count: int) -> str:
+    """
+    Build the factory search query for `count` wanted types.
+
+    The SQL text is built once per count and reused verbatim, so sqlite3's
+    per-connection statement cache returns the already prepared statement.
+    """
+    wanted = ', '.join(['(?)'] * count)
+
+    # All three strategies in one round trip:
+    # 1. Direct return type match, then 2. naming patterns (first branch),
+    # 3. T** output parameter, error-code pattern (second branch), e.g.
+    #    int foo_create(foo_t **out) returns error code, writes to output param.
+    # match_rank keeps the strategies in that order; within each, the
+    # documented version comes first.
+    # The NOCASE range on name restates the patterns' common prefix
+    # (LIKE is case-insensitive) so idx_name_nocase can serve them.
+    return f"""
+        WITH wanted(type_name) AS (VALUES {wanted})
+        SELECT w.type_name,
+               f.name, f.return_type, f.params_json, f.file_path, f.line_number,
+               f.source, f.doc_comment,
+               (f.return_type_normalized != w.type_name) AS match_rank,
+               {_SQL_FACTORY_SCORE} AS score,
+               (f.doc_comment IS NOT NULL AND f.doc_comment != '') AS has_doc,
+               f.id AS id
+        FROM wanted w
+        JOIN functions f
+          ON (f.return_type_normalized = w.type_name
+           OR (f.name COLLATE NOCASE >= w.type_name
+               AND f.name COLLATE NOCASE < w.type_name || '~'
+               AND (f.name LIKE w.type_name || '_new%'
+                 OR f.name LIKE w.type_name || '_create%'
+                 OR f.name LIKE w.type_name || '_from_%'
+                 OR f.name LIKE w.type_name || '_parse%'
+                 OR f.name LIKE w.type_name || '_alloc%'
+                 OR f.name LIKE w.type_name || '_init%')))
+        WHERE {_SQL_NOT_GETTER_NAME}
+
+        UNION ALL
+
+        SELECT w.type_name,
+               f.name, f.return_type, f.params_json, f.file_path, f.line_number,
+               f.source, f.doc_comment,
+               2 AS match_rank,
+               {_SQL_FACTORY_SCORE} AS score,
+               (f.doc_comment IS NOT NULL AND f.doc_comment != '') AS has_doc,
+               f.id AS id
+        FROM wanted w
+        JOIN function_params p
+          ON p.type_normalized = w.type_name AND p.pointer_depth >= 2
+        JOIN functions f
+          ON f.id = p.function_id
+        WHERE (f.return_type IN ('int', 'void') OR f.return_type LIKE '%error%' OR f.return_type LIKE '%status%')
+          AND (f.name LIKE '%_create%' OR f.name LIKE '%_new%' OR f.name LIKE '%_init%' OR f.name LIKE '%_alloc%' OR f.name LIKE '%_open%')
+          AND {_SQL_NOT_GETTER_NAME}
+
+        ORDER BY match_rank, has_doc DESC, id
+    """
+
+
+def find_factories_batch(
+    conn: sqlite3.Connection,
+    type_names: Iterable[str],
+    target_function_name: str = None,
+    limit: Optional[int] = None,
+) -> Dict[str, List[FunctionInfo]]:
+    """
+    Find factories for several types at once.
+
+    Same search and filtering as find_factories, but the three search
+    strategies run as one query over all requested types (per chunk of
+    _MAX_IN_PARAMS types) instead of three queries per type.
+
+    Returns:
+        Dict of {normalized_type: [FunctionInfo, ...]} for types with factories,
+        at most `limit` per type (best scored first)
+    """
+    normalized_types = list(dict.fromkeys(normalize_type(t) for t in type_names))
+
+    results = {}
+    memo = _lookup_memos.get(conn)
+    if memo is not None:
+        missing = []
+        for normalized in normalized_types:
+            key = ('factories', normalized, target_function_name, limit)
+            if key not in memo:
+                missing.append(normalized)
+            elif memo[key]:
+                results[normalized] = _memo_get(memo, key)
+        normalized_types = missing
+
+    rows_by_type: Dict[str, List[Tuple[tuple, int]]] = {t: [] for t in normalized_types}
+
+    for start in range(0, len(normalized_types), _MAX_IN_PARAMS):
+        chunk = normalized_types[start:start + _MAX_IN_PARAMS]
+        # Group by type, keeping strategy order: return type, naming, output param.
+        # The cursor is streamed; no intermediate row list is built.
+        for row in conn.execute(_factory_query(len(chunk)), chunk):
+            rows_by_type[row[0]].append((row[1:8], row[9]))
+
+    for normalized, rows in rows_by_type.items():
+        type_factories = _rank_factories(rows, normalized, target_function_name, limit)
+        if memo is not None:
+            _memo_store(memo, ('factories', normalized, target_function_name, limit), type_factories)
+        if type_factories:
+            results[normalized] = type_factories
+    return results
 
 
 def find_factories(
     conn: sqlite3.Connection,
     type_name: str,
     target_function_name: str = None,
+    limit: Optional[int] = None,
 ) -> List[FunctionInfo]:
     """
     Find functions that can create instances of the given type.
@@ -216,6 +496,7 @@ def find_factories(
         conn: Database connection
         type_name: Type to find factories for
         target_function_name: Optional name of target function for semantic filtering
+        limit: Optional maximum number of factories to return (best scored first)
 
     Searches by:
     1. Return type match (normalized)
@@ -230,114 +511,126 @@ def find_factories(
     prefers the one with documentation.
     """
     normalized = normalize_type(type_name)
+    return find_factories_batch(
+        conn, [normalized], target_function_name, limit
+    ).get(normalized, [])
 
-    # Direct return type match - order by doc_comment DESC to get documented version first
-    rows = conn.execute("""
-        SELECT name, return_type, params_json, file_path, line_number, source, doc_comment
-        FROM functions
-        WHERE return_type_normalized = ?
-        ORDER BY (doc_comment IS NOT NULL AND doc_comment != '') DESC
-    """, (normalized,)).fetchall()
-
-    # Also match naming patterns
-    pattern_rows = conn.execute("""
-        SELECT name, return_type, params_json, file_path, line_number, source, doc_comment
-        FROM functions
-        WHERE (name LIKE ? || '_new%'
-           OR name LIKE ? || '_create%'
-           OR name LIKE ? || '_from_%'
-           OR name LIKE ? || '_parse%'
-           OR name LIKE ? || '_alloc%'
-           OR name LIKE ? || '_init%')
-          AND name NOT IN (SELECT name FROM functions WHERE return_type_normalized = ?)
-        ORDER BY (doc_comment IS NOT NULL AND doc_comment != '') DESC
-    """, (normalized, normalized, normalized, normalized, normalized, normalized, normalized)).fetchall()
-
-    # Find functions with T** output parameter (error-code pattern)
-    # e.g., int foo_create(foo_t **out) returns error code, writes to output param
-    double_ptr_pattern = f'%{normalized}%**%'
-    output_param_rows = conn.execute("""
-        SELECT name, return_type, params_json, file_path, line_number, source, doc_comment
-        FROM functions
-        WHERE params_json LIKE ?
-          AND (return_type IN ('int', 'void') OR return_type LIKE '%error%' OR return_type LIKE '%status%')
-          AND (name LIKE '%_create%' OR name LIKE '%_new%' OR name LIKE '%_init%' OR name LIKE '%_alloc%' OR name LIKE '%_open%')
-        ORDER BY (doc_comment IS NOT NULL AND doc_comment != '') DESC
-    """, (double_ptr_pattern,)).fetchall()
-
-    # Deduplicate by name - keep first occurrence (which has doc_comment if available)
-    seen = set()
-    candidates = []
-    for row in rows + pattern_rows + output_param_rows:
-        func = FunctionInfo.from_row(row)
-        if func.name not in seen:
-            seen.add(func.name)
-            candidates.append(func)
-
-    # Filter out getters/ref-counters, semantically opposite, and score remaining
-    results = []
-    for func in candidates:
-        if _is_getter_or_ref_counter(func, normalized):
-            continue
-        if _is_semantically_opposite(func.name, target_function_name):
-            continue
-        results.append((func, _score_factory(func)))
-
-    # Sort by score descending
-    results.sort(key=lambda x: x[1], reverse=True)
 
-    return [func for func, _ in results]
+# A type defined in several files has a row for each (see INSERT_TYPE_SQL):
+# keep only the definition from the file listed last in the build, as a
+# full build that overwrote earlier definitions would
+_SQL_LATEST_TYPE = """id = (
+    SELECT d.id FROM types d LEFT JOIN files f ON f.path = d.file_path
+    WHERE d.name = types.name
+    ORDER BY f.file_order DESC, d.id DESC
+    LIMIT 1
+)"""
 
 
 def find_type(conn: sqlite3.Connection, type_name: str) -> Optional[TypeInfo]:
     """Find a type definition by name."""
+    memo = _lookup_memos.get(conn)
+    key = ('type', type_name)
+    if memo is not None and key in memo:
+        return _memo_get(memo, key)
+
     normalized = normalize_type(type_name)
 
-    row = conn.execute("""
+    row = conn.execute(f"""
         SELECT name, category, enum_values_json, file_path, source, pointer_to
         FROM types
-        WHERE name = ? OR name = ?
+        WHERE (name = ? OR name = ?) AND {_SQL_LATEST_TYPE}
         LIMIT 1
     """, (type_name, normalized)).fetchone()
 
-    return TypeInfo.from_row(row) if row else None
+    type_info = TypeInfo.from_row(row) if row else None
+    if memo is not None:
+        _memo_store(memo, key, type_info)
+    return type_info
 
 
-def find_types_by_category(conn: sqlite3.Connection, category: str) -> List[TypeInfo]:
-    """Find all types of a given category."""
-    rows = conn.execute("""
+@lru_cache(maxsize=None)
+def _types_query(count: int) -> str:
+    """Build the find_types IN query for `count` names (built once per count, see _factory_query)."""
+    placeholders = ','.join('?' * count)
+    return f"""
         SELECT name, category, enum_values_json, file_path, source, pointer_to
         FROM types
-        WHERE category = ?
-    """, (category,)).fetchall()
+        WHERE name IN ({placeholders}) AND {_SQL_LATEST_TYPE}
+    """
 
-    return [TypeInfo.from_row(row) for row in rows]
 
+def find_types(conn: sqlite3.Connection, type_names: Iterable[str]) -> Dict[str, TypeInfo]:
+    """
+    Find type definitions for several names with batched IN queries.
 
-def _is_destructor(func_name: str) -> bool:
-    """Check if a function name suggests it's a destructor/cleanup function."""
-    name_lower = func_name.lower()
-    destructor_patterns = (
-        '_free', '_destroy', '_release', '_cleanup', '_close',
-        '_finish', '_final', '_done', '_end', '_deinit',
-    )
-    return any(pat in name_lower for pat in destructor_patterns)
+    Each name is matched as given or normalized, like find_type.
 
+    Returns:
+        Dict of {requested_name: TypeInfo} for the names that were found
+    """
+    names = list(dict.fromkeys(type_names))
+
+    results = {}
+    memo = _lookup_memos.get(conn)
+    if memo is not None:
+        missing = []
+        for name in names:
+            key = ('types', name)
+            if key not in memo:
+                missing.append(name)
+            elif memo[key]:
+                results[name] = _memo_get(memo, key)
+        names = missing
+
+    lookup_keys = list(dict.fromkeys(
+        key for name in names for key in (name, normalize_type(name))
+    ))
+
+    by_name = {}
+    for start in range(0, len(lookup_keys), _MAX_IN_PARAMS):
+        chunk = lookup_keys[start:start + _MAX_IN_PARAMS]
+        rows = conn.execute(_types_query(len(chunk)), chunk).fetchall()
+        for row in rows:
+            by_name[row[0]] = TypeInfo.from_row(row)
+
+    for name in names:
+        type_info = by_name.get(name) or by_name.get(normalize_type(name))
+        if memo is not None:
+            _memo_store(memo, ('types', name), type_info)
+        if type_info:
+            results[name] = type_info
+    return results
 
-def _is_update_function(func_name: str) -> bool:
-    """Check if a function name suggests it's an update/process function (needs initialized state)."""
-    name_lower = func_name.lower()
-    update_patterns = ('_update', '_process', '_step', '_feed', '_write', '_read')
-    return any(pat in name_lower for pat in update_patterns)
 
+def find_types_by_category(conn: sqlite3.Connection, category: str) -> List[TypeInfo]:
+    """Find all types of a given category."""
+    memo = _lookup_memos.get(conn)
+    key = ('category', category)
+    if memo is not None and key in memo:
+        return _memo_get(memo, key)
 
-def _score_initializer(func: FunctionInfo) -> int:
+    rows = conn.execute(f"""
+        SELECT name, category, enum_values_json, file_path, source, pointer_to
+        FROM types
+        WHERE category = ? AND {_SQL_LATEST_TYPE}
+    """, (category,)).fetchall()
+
+    types = [TypeInfo.from_row(row) for row in rows]
+    if memo is not None:
+        _memo_store(memo, key, types)
+    return types
+
+
+def _score_initializer(func: FunctionInfo, param_count: int) -> int:
     """
     Score an initializer function by how likely it is to be the primary initializer.
 
+    param_count is the function's param_count column from the index.
+
     Higher score = more likely to be used first.
     """
-    name = func.name.lower()
+    name = func.name_lower
     score = 0
 
     # Naming patterns (higher = better for initialization)
@@ -359,9 +652,9 @@ def _score_initializer(func: FunctionInfo) -> int:
         score += 30
 
     # Prefer functions with fewer required params (easier to call)
-    if len(func.params) <= 2:
+    if param_count <= 2:
         score += 20
-    elif len(func.params) <= 4:
+    elif param_count <= 4:
         score += 10
 
     # Bonus for documented functions
@@ -371,6 +664,23 @@ def _score_initializer(func: FunctionInfo) -> int:
     return score
 
 
+# Initializer candidates taking a (normalized) type as a parameter, by name:
+# initializer-like names, excluding destructors (they need an initialized
+# object) and update/process functions (they need initialized state).
+# A function taking the type twice yields two rows; callers dedupe by name.
+_FIND_INITIALIZERS_SQL = f"""
+    SELECT f.name, f.return_type, f.params_json, f.file_path, f.line_number,
+           f.source, f.doc_comment, f.param_count
+    FROM function_params p
+    JOIN functions f ON f.id = p.function_id
+    WHERE p.type_normalized = ?
+      AND (f.return_type IN ('int', 'void') OR f.return_type LIKE '%error%' OR f.return_type LIKE '%status%')
+      AND (f.name_tags & {NAME_TAG_INITIALIZER | NAME_TAG_DESTRUCTOR | NAME_TAG_UPDATE})
+          = {NAME_TAG_INITIALIZER}
+    ORDER BY (f.doc_comment IS NOT NULL AND f.doc_comment != '') DESC, f.id
+"""
+
+
 def find_initializers(
     conn: sqlite3.Connection,
     type_name: str,
@@ -394,63 +704,99 @@ def find_initializers(
     """
     normalized = normalize_type(type_name)
 
-    # Strategy 1: Find functions that take this type as a parameter
-    # and have initializer-like names
-    # Search for the type name in params_json
-    type_pattern = f'%{normalized}%'
+    memo = _lookup_memos.get(conn)
+    key = ('initializers', normalized, target_function_name)
+    if memo is not None and key in memo:
+        return _memo_get(memo, key)
 
-    rows = conn.execute("""
-        SELECT name, return_type, params_json, file_path, line_number, source, doc_comment
-        FROM functions
-        WHERE params_json LIKE ?
-          AND (return_type IN ('int', 'void') OR return_type LIKE '%error%' OR return_type LIKE '%status%')
-        ORDER BY (doc_comment IS NOT NULL AND doc_comment != '') DESC
-    """, (type_pattern,)).fetchall()
+    # Strategy 1: Find functions that take this type as a parameter
+    # and have initializer-like names (function_params index lookup)
+    rows = conn.execute(_FIND_INITIALIZERS_SQL, (normalized,)).fetchall()
 
     # Deduplicate and filter
+    excluded = _opposite_factory_re(target_function_name)
     seen = set()
     candidates = []
 
     for row in rows:
-        func = FunctionInfo.from_row(row)
+        func = FunctionInfo.from_row(row[:7])
 
         if func.name in seen:
             continue
         seen.add(func.name)
 
-        # Skip if it's a destructor
-        if _is_destructor(func.name):
-            continue
-
-        # Skip update/process functions (they need initialized state, not create it)
-        if _is_update_function(func.name):
-            continue
+        # The query already guarantees a parameter of this type and an
+        # initializer-like name that isn't a destructor or update function
 
         # Skip semantically opposite functions
-        if _is_semantically_opposite(func.name, target_function_name):
+        if excluded is not None and excluded.search(func.name_lower):
             continue
 
-        # Must have initializer-like name pattern
-        if not _is_initializer_pattern(func.name):
-            continue
+        candidates.append((func, _score_initializer(func, row[7])))
 
-        # Verify this function actually takes the type as a parameter
-        has_type_param = False
-        for param in func.params:
-            param_normalized = normalize_type(param.type)
-            if param_normalized == normalized:
-                has_type_param = True
-                break
+    # Sort by score descending
+    candidates.sort(key=lambda x: x[1], reverse=True)
 
-        if not has_type_param:
-            continue
+    initializers = [func for func, _ in candidates]
+    if memo is not None:
+        _memo_store(memo, key, initializers)
+    return initializers
 
-        candidates.append((func, _score_initializer(func)))
 
-    # Sort by score descending
-    candidates.sort(key=lambda x: x[1], reverse=True)
+def collect_factories(
+    conn: sqlite3.Connection,
+    type_names: Iterable[str],
+    factories: dict,
+    visited: Set[str],
+    max_depth: int = 1,
+    target_function_name: str = None,
+    limit: Optional[int] = None,
+) -> None:
+    """
+    Collect factory functions for types and their dependencies, level by level.
 
-    return [func for func, _ in candidates]
+    Each level of the traversal is fetched with one find_factories_batch
+    call; the next level is made of the struct pointer parameters of the
+    factories just found.
+
+    Args:
+        conn: Database connection
+        type_names: Types to find factories for (depth 0)
+        factories: Dict to populate {type_name: [FunctionInfo, ...]}
+        visited: Set of already-visited types
+        max_depth: Maximum depth to follow factory parameters
+        target_function_name: Name of target function for semantic filtering
+        limit: Optional maximum number of factories kept (and followed) per type
+    """
+    def admit(type_name: str, frontier: Dict[str, None]) -> None:
+        normalized = normalize_type(type_name)
+        if normalized not in visited:
+            frontier[normalized] = None
+
+    frontier: Dict[str, None] = {}
+    for type_name in type_names:
+        admit(type_name, frontier)
+
+    depth = 0
+    while frontier and depth <= max_depth:
+        visited.update(frontier)
+        found = find_factories_batch(conn, frontier, target_function_name, limit)
+
+        next_frontier: Dict[str, None] = {}
+        for normalized in frontier:
+            type_factories = found.get(normalized)
+            if not type_factories:
+                continue
+            factories[normalized] = type_factories
+
+            # Follow factory parameters (for struct pointers)
+            for factory in type_factories:
+                for param in factory.params:
+                    if categorize_type(param.type) == 'struct_ptr':
+                        admit(param.type, next_frontier)
+
+        frontier = next_frontier
+        depth += 1
 
 
 def collect_factories_recursive(
@@ -461,9 +807,12 @@ def collect_factories_recursive(
     depth: int = 0,
     max_depth: int = 1,
     target_function_name: str = None,
+    limit: Optional[int] = None,
 ) -> None:
     """
-    Recursively collect factory functions for a type and its dependencies.
+    Collect factory functions for a type and its dependencies.
+
+    Single-type entry point kept for compatibility; see collect_factories.
 
     Args:
         conn: Database connection
@@ -473,32 +822,14 @@ def collect_factories_recursive(
         depth: Current recursion depth
         max_depth: Maximum recursion depth
         target_function_name: Name of target function for semantic filtering
+        limit: Optional maximum number of factories kept (and followed) per type
     """
-    normalized = normalize_type(type_name)
-
-    if normalized in visited or depth > max_depth:
-        return
-
-    visited.add(normalized)
-
-    type_factories = find_factories(conn, type_name, target_function_name)
-    if type_factories:
-        factories[normalized] = type_factories
-
-        # Recurse into factory parameters (for struct pointers)
-        for factory in type_factories:
-            for param in factory.params:
-                param_category = categorize_type(param.type)
-                if param_category == 'struct_ptr':
-                    collect_factories_recursive(
-                        conn,
-                        param.type,
-                        factories,
-                        visited,
-                        depth + 1,
-                        max_depth,
-                        target_function_name,
-                    )
+    collect_factories(
+        conn, [type_name], factories, visited,
+        max_depth=max_depth - depth,
+        target_function_name=target_function_name,
+        limit=limit,
+    )
 
 
 def get_all_functions(conn: sqlite3.Connection, limit: int = 1000) -> List[FunctionInfo]:
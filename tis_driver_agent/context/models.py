@@ -1,11 +1,19 @@
 """Data models for AST context retrieval."""
 
 from dataclasses import dataclass, field, asdict
+from functools import cached_property
 from typing import List, Optional
 import json
+import sys
 
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
 
-@dataclass
+
+@dataclass(slots=True)
 class Param:
     """Function parameter."""
     type: str
@@ -34,14 +42,31 @@ class FunctionInfo:
             "doc_comment": self.doc_comment,
         }
 
+    @cached_property
+    def name_lower(self) -> str:
+        """Lowercased name, shared by the lookup name-pattern checks."""
+        return self.name.lower()
+
+    @cached_property
+    def signature(self) -> str:
+        """Declaration part of the source (before any body), ending in ';'."""
+        brace = self.source.find('{')
+        sig = (self.source[:brace] if brace != -1 else self.source).strip()
+        if not sig.endswith(';'):
+            sig += ';'
+        return sig
+
     @classmethod
     def from_row(cls, row: tuple) -> "FunctionInfo":
         """Create from SQLite row."""
         name, return_type, params_json, file_path, line_number, source, doc_comment = row
-        params = [Param(**p) for p in json.loads(params_json)] if params_json else []
+        params = [
+            Param(type=sys.intern(p['type']), name=p['name'])
+            for p in _json_loads(params_json)
+        ] if params_json else []
         return cls(
             name=name,
-            return_type=return_type,
+            return_type=sys.intern(return_type),
             params=params,
             file_path=file_path,
             line_number=line_number,
@@ -69,7 +94,7 @@ class TypeInfo:
             pointer_to = None
         else:
             name, category, enum_values_json, file_path, source, pointer_to = row
-        enum_values = json.loads(enum_values_json) if enum_values_json else []
+        enum_values = _json_loads(enum_values_json) if enum_values_json else []
         return cls(
             name=name,
             category=category,
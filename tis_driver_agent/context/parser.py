@@ -1,7 +1,9 @@
 """Tree-sitter based C code parsing."""
 
-from typing import List, Optional
+from functools import lru_cache
+from typing import List, Optional, Tuple
 import re
+import sys
 
 try:
     import tree_sitter_c as tsc
@@ -10,18 +12,66 @@ try:
 except ImportError:
     TREE_SITTER_AVAILABLE = False
 
+try:
+    from tree_sitter import Query, QueryCursor
+except ImportError:
+    # tree-sitter < 0.25: nodes are collected with a Python walk instead
+    QueryCursor = None
+
 from .models import FunctionInfo, TypeInfo, Param
 
 
+@lru_cache(maxsize=None)
+def _get_language() -> "Language":
+    """Get the tree-sitter C language (loaded once)."""
+    return Language(tsc.language())
+
+
 def get_parser() -> Optional["Parser"]:
     """Get tree-sitter parser for C."""
     if not TREE_SITTER_AVAILABLE:
         return None
-    language = Language(tsc.language())
-    parser = Parser(language)
+    parser = Parser(_get_language())
     return parser
 
 
+@lru_cache(maxsize=None)
+def _node_query(node_types: Tuple[str, ...]) -> Optional["Query"]:
+    """Compiled query capturing every node of the given types, or None without the Query API."""
+    if QueryCursor is None:
+        return None
+    patterns = ' '.join(f'({node_type})' for node_type in node_types)
+    return Query(_get_language(), f'[{patterns}] @node')
+
+
+def _find_nodes_by_type(root, node_types: Tuple[str, ...]) -> List:
+    """
+    Find all nodes of the given types in a tree, in pre-order (source order).
+
+    Matching runs in tree-sitter's query engine when available, so only the
+    matched nodes cross into Python. Every subtree is searched, function
+    bodies included: with unexpanded macros tree-sitter's error recovery can
+    nest real top-level prototypes inside a body.
+    """
+    query = _node_query(node_types)
+    if query is not None:
+        nodes = QueryCursor(query).captures(root).get('node', [])
+        # Captures aren't in document order: sort by start, enclosing node first
+        nodes.sort(key=lambda node: (node.start_byte, -node.end_byte))
+        return nodes
+
+    # Iterative walk. Only named children are pushed: anonymous nodes are
+    # punctuation/keyword leaves
+    nodes = []
+    stack = [root]
+    while stack:
+        node = stack.pop()
+        if node.type in node_types:
+            nodes.append(node)
+        stack.extend(reversed(node.named_children))
+    return nodes
+
+
 def extract_leading_comment(node, source_bytes: bytes) -> str:
     """
     Extract doc comment immediately preceding a node.
@@ -38,9 +88,9 @@ def extract_leading_comment(node, source_bytes: bytes) -> str:
         if prev.type == 'comment':
             comment_text = source_bytes[prev.start_byte:prev.end_byte].decode('utf-8', errors='replace')
 
-            # Check for gap between comment and target
-            gap_text = source_bytes[prev.end_byte:current.start_byte].decode('utf-8', errors='replace')
-            if gap_text.count('\n') > 2:
+            # Check for gap between comment and target (newlines counted
+            # on the raw bytes: no need to decode the gap)
+            if source_bytes[prev.end_byte:current.start_byte].count(b'\n') > 2:
                 break
 
             comments.insert(0, comment_text)
@@ -89,13 +139,13 @@ def _find_children_by_type(node, type_name: str) -> List:
 
 
 def _find_descendant_by_type(node, type_name: str):
-    """Find first descendant of a specific type (recursive)."""
-    for child in node.children:
+    """Find first descendant of a specific type (depth-first, in source order)."""
+    stack = node.named_children[::-1]
+    while stack:
+        child = stack.pop()
         if child.type == type_name:
             return child
-        result = _find_descendant_by_type(child, type_name)
-        if result:
-            return result
+        stack.extend(reversed(child.named_children))
     return None
 
 
@@ -146,6 +196,9 @@ def _parse_params(params_node, source_bytes: bytes) -> List[Param]:
     return params
 
 
+_IDENT_CHAR_RE = re.compile(rb'[0-9A-Za-z_]')
+
+
 def _extract_function_info(node, file_path: str, source_bytes: bytes) -> Optional[FunctionInfo]:
     """Extract function info from a function_definition or declaration node."""
     # Find the function declarator and collect type specifiers
@@ -164,14 +217,12 @@ def _extract_function_info(node, file_path: str, source_bytes: bytes) -> Optiona
             inner_declarator = _find_descendant_by_type(child, 'function_declarator')
             if inner_declarator:
                 declarator = inner_declarator
-                # Count asterisks in the pointer_declarator (excluding nested ones)
-                ptr_text = _get_node_text(child, source_bytes)
                 # Count only the leading asterisks before the function name
-                for c in ptr_text:
-                    if c == '*':
-                        pointer_count += 1
-                    elif c.isalnum() or c == '_':
-                        break
+                ptr_bytes = source_bytes[child.start_byte:child.end_byte]
+                name_start = _IDENT_CHAR_RE.search(ptr_bytes)
+                pointer_count += ptr_bytes.count(
+                    b'*', 0, name_start.start() if name_start else len(ptr_bytes)
+                )
 
     if not declarator:
         return None
@@ -216,33 +267,19 @@ def extract_functions(tree, file_path: str, source_bytes: bytes) -> List[Functio
     functions = []
     processed = set()
 
-    def walk_tree(node):
-        # Check for function definitions
-        if node.type == 'function_definition':
-            func_info = _extract_function_info(node, file_path, source_bytes)
-            if func_info:
-                key = (func_info.name, file_path)
-                if key not in processed:
-                    processed.add(key)
-                    functions.append(func_info)
-
-        # Check for function declarations (prototypes)
-        elif node.type == 'declaration':
-            # Check if this declaration contains a function_declarator
-            func_decl = _find_descendant_by_type(node, 'function_declarator')
-            if func_decl:
-                func_info = _extract_function_info(node, file_path, source_bytes)
-                if func_info:
-                    key = (func_info.name, file_path)
-                    if key not in processed:
-                        processed.add(key)
-                        functions.append(func_info)
-
-        # Recurse into children
-        for child in node.children:
-            walk_tree(child)
+    for node in _find_nodes_by_type(tree.root_node, ('function_definition', 'declaration')):
+        # Function definitions, and declarations (prototypes) containing
+        # a function_declarator
+        if node.type == 'declaration' and not _find_descendant_by_type(node, 'function_declarator'):
+            continue
+
+        func_info = _extract_function_info(node, file_path, source_bytes)
+        if func_info:
+            key = (func_info.name, file_path)
+            if key not in processed:
+                processed.add(key)
+                functions.append(func_info)
 
-    walk_tree(tree.root_node)
     return functions
 
 
@@ -357,36 +394,54 @@ def extract_types(tree, file_path: str, source_bytes: bytes) -> List[TypeInfo]:
     types = []
     processed = set()
 
-    def walk_tree(node):
-        # Check for type definitions
-        if node.type in ('struct_specifier', 'enum_specifier', 'type_definition'):
-            type_info = _extract_type_info(node, file_path, source_bytes)
-            if type_info and type_info.name not in processed:
-                processed.add(type_info.name)
-                types.append(type_info)
-
-        # Recurse into children
-        for child in node.children:
-            walk_tree(child)
+    type_nodes = _find_nodes_by_type(
+        tree.root_node, ('struct_specifier', 'enum_specifier', 'type_definition')
+    )
+    for node in type_nodes:
+        type_info = _extract_type_info(node, file_path, source_bytes)
+        if type_info and type_info.name not in processed:
+            processed.add(type_info.name)
+            types.append(type_info)
 
-    walk_tree(tree.root_node)
     return types
 
 
+# Type string patterns (compiled once, for categorize_type and normalize_type)
+
+# categorize_type's first four rules in one anchored match, in priority
+# order: primitives, fixed-width integers, strings, then a function pointer
+# anywhere in the string.
+_TYPE_CATEGORY_RE = re.compile(r"""
+    (?:const\s+)?(?:
+        (?:unsigned\s+)?(?:int|long|short|char|float|double|void)\s*$ (?P<primitive>)
+      | (?:u?int\d+_t|size_t|ssize_t|ptrdiff_t|bool|_Bool)\s*$ (?P<fixed_width>)
+      | char\s*\* (?P<string>)
+    )
+  | (?s:.*?)\(\s*\*\s*\) (?P<func_ptr>)
+""", re.VERBOSE)
+_TYPE_CATEGORY_BY_GROUP = {
+    'primitive': 'primitive',
+    'fixed_width': 'primitive',
+    'string': 'string',
+    'func_ptr': 'func_ptr',
+}
+
+_UPPER_T_TYPE_RE = re.compile(r'^[A-Z].*_t$')
+_LOWER_T_TYPE_RE = re.compile(r'^[a-z_]+_t$')
+_CONST_RE = re.compile(r'\bconst\b')
+_QUALIFIER_RE = re.compile(r'\b(?:const|struct|enum)\b')
+_TRAILING_STARS_RE = re.compile(r'\*+$')
+
+
+@lru_cache(maxsize=8192)
 def categorize_type(type_str: str) -> str:
-    """Categorize a type string."""
+    """Categorize a type string (cached, like normalize_type)."""
     t = type_str.strip()
 
-    # Check for explicit primitives first
-    if re.match(r'^(const\s+)?(unsigned\s+)?(int|long|short|char|float|double|void)\s*$', t):
-        return 'primitive'
-    # Standard fixed-width integer types
-    if re.match(r'^(const\s+)?(u?int\d+_t|size_t|ssize_t|ptrdiff_t|bool|_Bool)\s*$', t):
-        return 'primitive'
-    if re.match(r'(const\s+)?char\s*\*', t):
-        return 'string'
-    if re.search(r'\(\s*\*\s*\)', t):
-        return 'func_ptr'
+    # Explicit primitives, fixed-width integers, strings, function pointers
+    m = _TYPE_CATEGORY_RE.match(t)
+    if m:
+        return _TYPE_CATEGORY_BY_GROUP[m.lastgroup]
     if 'enum' in t:
         return 'enum'
     if '*' in t or 'struct' in t:
@@ -394,28 +449,28 @@ def categorize_type(type_str: str) -> str:
     # Types ending with _t that aren't standard primitives are likely typedef'd pointers
     # Examples: TCAesKeySched_t, json_object_t, etc.
     # Remove const qualifier for matching
-    bare_type = re.sub(r'\bconst\b', '', t).strip()
-    if re.match(r'^[A-Z].*_t$', bare_type):
+    bare_type = _CONST_RE.sub('', t).strip()
+    if _UPPER_T_TYPE_RE.match(bare_type):
         # Capitalized type ending in _t - likely a typedef'd pointer (common C convention)
         return 'struct_ptr'
-    if re.match(r'^[a-z_]+_t$', bare_type) and bare_type not in ('size_t', 'ssize_t', 'ptrdiff_t'):
+    if _LOWER_T_TYPE_RE.match(bare_type) and bare_type not in ('size_t', 'ssize_t', 'ptrdiff_t'):
         # Lowercase type ending in _t that's not a standard type - might be a typedef'd pointer
         return 'struct_ptr'
     return 'primitive'
 
 
+@lru_cache(maxsize=4096)
 def normalize_type(type_str: str) -> str:
     """
     Normalize type for database lookup.
 
+    Results are cached and interned: type strings repeat heavily across a
+    codebase and are used as set/dict keys throughout factory collection.
+
     'struct json_object *' -> 'json_object'
     'const char *'         -> 'char'
     'enum json_type'       -> 'json_type'
     """
-    t = type_str.strip()
-    t = re.sub(r'\bconst\b', '', t)
-    t = re.sub(r'\bstruct\b', '', t)
-    t = re.sub(r'\benum\b', '', t)
-    t = re.sub(r'\*+$', '', t)
-    t = re.sub(r'\s+', ' ', t).strip()
-    return t
+    t = _QUALIFIER_RE.sub('', type_str.strip())
+    t = _TRAILING_STARS_RE.sub('', t)
+    return sys.intern(' '.join(t.split()))
@@ -7,7 +7,7 @@ from .state import DriverState
 from .nodes.planner import planner_node
 from .nodes.router import router_node, route_decision
 from .nodes.generator import generator_node
-from .nodes.validator import validator_node
+from .nodes.validator import validator_node, driver_filename
 from .nodes.refiner import refiner_node
 
 
@@ -35,15 +35,16 @@ def create_workflow(
 
     # Output handler
     def output_handler(state: DriverState) -> DriverState:
+        # The validator reuses its driver file across rounds; the run is over
+        tis_runner.cleanup(driver_filename(state["function_name"]))
+
         if not state.get("validation_errors"):
             return {
-                **state,
                 "final_driver": state["current_driver_code"],
                 "status": "success",
             }
         # Even on failure, keep the last driver code for reference
         return {
-            **state,
             "final_driver": state.get("current_driver_code"),
             "status": "failed",
         }
@@ -10,6 +10,7 @@ from .registry import (
     KNOWN_MODELS,
     ModelInfo,
     get_model_names,
+    get_model_info,
     is_ollama_model,
     is_anthropic_model,
     get_provider,
@@ -25,6 +26,7 @@ __all__ = [
     "KNOWN_MODELS",
     "ModelInfo",
     "get_model_names",
+    "get_model_info",
     "is_ollama_model",
     "is_anthropic_model",
     "get_provider",
@@ -1,10 +1,11 @@
 """Anthropic model adapter."""
 
-import re
-from typing import Optional
+from typing import Iterator, Optional
 
 from anthropic import Anthropic
 
+from .extract import extract_code
+
 
 class AnthropicAdapter:
     """Adapter for Anthropic API (Claude models)."""
@@ -27,8 +28,8 @@ class AnthropicAdapter:
         # All other Claude models support 8192
         return 8192
 
-    def invoke(self, prompt: str, system_prompt: str = None) -> str:
-        """Send prompt to model and get response."""
+    def _request_kwargs(self, prompt: str, system_prompt: str = None) -> dict:
+        """Build the messages request."""
         kwargs = {
             "model": self.model,
             "max_tokens": self._get_max_tokens(),
@@ -39,25 +40,20 @@ class AnthropicAdapter:
         if system_prompt:
             kwargs["system"] = system_prompt
 
-        response = self.client.messages.create(**kwargs)
+        return kwargs
+
+    def invoke(self, prompt: str, system_prompt: str = None) -> str:
+        """Send prompt to model and get response."""
+        response = self.client.messages.create(**self._request_kwargs(prompt, system_prompt))
 
         return response.content[0].text
 
+    def invoke_stream(self, prompt: str, system_prompt: str = None) -> Iterator[str]:
+        """Send prompt to model and yield the response text as it arrives."""
+        # Closing the generator early closes the stream and ends generation
+        with self.client.messages.stream(**self._request_kwargs(prompt, system_prompt)) as stream:
+            yield from stream.text_stream
+
     def extract_code(self, response: str) -> str:
         """Extract C code from markdown response."""
-        # Look for ```c ... ``` blocks
-        pattern = r"```c\s*(.*?)\s*```"
-        matches = re.findall(pattern, response, re.DOTALL)
-
-        if matches:
-            return matches[0].strip()
-
-        # Fallback: try to find any code block
-        pattern = r"```\s*(.*?)\s*```"
-        matches = re.findall(pattern, response, re.DOTALL)
-
-        if matches:
-            return matches[0].strip()
-
-        # Last resort: return as-is (might be raw code)
-        return response.strip()
+        return extract_code(response)
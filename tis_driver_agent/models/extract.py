@@ -0,0 +1,72 @@
+"""Code extraction from model responses, shared by the adapters."""
+
+import re
+from typing import Iterable, Tuple
+
+
+# Fenced code blocks: ```c ... ``` first, then any ``` ... ```
+_C_BLOCK_RE = re.compile(r"```c\s*(.*?)\s*```", re.DOTALL)
+_ANY_BLOCK_RE = re.compile(r"```\s*(.*?)\s*```", re.DOTALL)
+
+# Opening fence of a _C_BLOCK_RE block, and the fence that closes it
+_C_FENCE = "```c"
+_FENCE = "```"
+
+
+def extract_code(response: str) -> str:
+    """Extract C code from markdown response."""
+    # Look for ```c ... ``` blocks
+    match = _C_BLOCK_RE.search(response)
+    if match:
+        return match.group(1).strip()
+
+    # Fallback: try to find any code block
+    match = _ANY_BLOCK_RE.search(response)
+    if match:
+        return match.group(1).strip()
+
+    # Last resort: return as-is (might be raw code)
+    return response.strip()
+
+
+def read_until_code_block(chunks: Iterable[str]) -> Tuple[str, bool]:
+    """
+    Join streamed response chunks, stopping once the first ```c block closes.
+
+    The first ```c block of a response is complete as soon as its closing
+    fence arrives, so extract_code() gives the same result on the returned
+    prefix as on the full response. Each chunk is scanned once: for the
+    opening fence until it is found, then for the closing fence after it.
+    The chunk iterator is closed on return, which lets a streaming adapter
+    cancel the rest of the generation.
+
+    Returns:
+        (response, truncated): truncated is True if reading stopped after the
+        code block, before the end of the stream
+    """
+    parts = []
+    # Text still to scan: the new chunk plus the end of the previous one,
+    # in case a fence is split across chunks
+    tail = ""
+    opened = False
+    truncated = False
+    try:
+        for chunk in chunks:
+            parts.append(chunk)
+            tail += chunk
+            if not opened:
+                start = tail.find(_C_FENCE)
+                if start == -1:
+                    tail = tail[-(len(_C_FENCE) - 1):]
+                    continue
+                opened = True
+                tail = tail[start + len(_C_FENCE):]
+            if _FENCE in tail:
+                truncated = True
+                break
+            tail = tail[-(len(_FENCE) - 1):]
+    finally:
+        close = getattr(chunks, "close", None)
+        if close is not None:
+            close()
+    return "".join(parts), truncated
@@ -3,7 +3,7 @@
 import os
 import sys
 
-from .registry import is_ollama_model, is_anthropic_model
+from .registry import get_provider
 from .openai_adapter import OpenAIAdapter
 from .ollama_adapter import OllamaAdapter
 from .anthropic_adapter import AnthropicAdapter
@@ -27,7 +27,9 @@ def create_model_adapter(
     Returns:
         Model adapter instance (OpenAIAdapter, AnthropicAdapter, or OllamaAdapter)
     """
-    if is_ollama_model(model):
+    provider = get_provider(model)
+
+    if provider == "ollama":
         adapter = OllamaAdapter(
             model=model,
             base_url=ollama_url or "http://localhost:11434",
@@ -39,7 +41,7 @@ def create_model_adapter(
             print("Make sure Ollama is running: `ollama serve`")
             print(f"And the model is pulled: `ollama pull {model}`")
         return adapter
-    elif is_anthropic_model(model):
+    elif provider == "anthropic":
         anthropic_key = os.getenv("ANTHROPIC_API_KEY")
         if not anthropic_key:
             print("Error: ANTHROPIC_API_KEY not found.")
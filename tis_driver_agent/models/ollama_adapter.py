@@ -1,8 +1,12 @@
 """Ollama model adapter for local LLM inference."""
 
-import re
+import json
+
 import requests
-from typing import Optional
+from requests.adapters import HTTPAdapter
+from typing import Iterator, Optional, Tuple
+
+from .extract import extract_code
 
 
 class OllamaAdapter:
@@ -17,9 +21,19 @@ class OllamaAdapter:
         self.model = model
         self.base_url = base_url.rstrip("/")
         self.temperature = temperature
+        # Keep-alive connections to the server, reused across calls
+        self._session = requests.Session()
+        self._session.mount("http://", HTTPAdapter(pool_connections=4, pool_maxsize=4))
+        self._session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=4))
+        # Model names reported by /api/tags, fetched on first successful probe
+        self._available_models: Optional[Tuple[str, ...]] = None
 
     def invoke(self, prompt: str, system_prompt: str = None) -> str:
         """Send prompt to Ollama model and get response."""
+        return "".join(self.invoke_stream(prompt, system_prompt))
+
+    def invoke_stream(self, prompt: str, system_prompt: str = None) -> Iterator[str]:
+        """Send prompt to Ollama model and yield the response text as it arrives."""
         url = f"{self.base_url}/api/generate"
 
         # Build the full prompt with system prompt if provided
@@ -30,17 +44,31 @@ class OllamaAdapter:
         payload = {
             "model": self.model,
             "prompt": full_prompt,
-            "stream": False,
+            "stream": True,
             "options": {
                 "temperature": self.temperature,
             },
         }
 
         try:
-            response = requests.post(url, json=payload, timeout=None)
-            response.raise_for_status()
-            result = response.json()
-            return result.get("response", "")
+            # Stream the generation: tokens are consumed as they are produced
+            # instead of waiting for the server to buffer the whole response.
+            # Closing the generator early drops the connection, which makes
+            # Ollama stop generating. Connecting fails fast when no server
+            # is listening; reads have no limit, as generation can be slow.
+            with self._session.post(
+                url, json=payload, stream=True, timeout=(5, None)
+            ) as response:
+                response.raise_for_status()
+                for line in response.iter_lines():
+                    if not line:
+                        continue
+                    chunk = json.loads(line)
+                    if "error" in chunk:
+                        raise RuntimeError(f"Ollama error: {chunk['error']}")
+                    yield chunk.get("response", "")
+                    if chunk.get("done"):
+                        break
         except requests.exceptions.ConnectionError:
             raise ConnectionError(
                 f"Could not connect to Ollama at {self.base_url}. "
@@ -49,33 +77,31 @@ class OllamaAdapter:
 
     def extract_code(self, response: str) -> str:
         """Extract C code from markdown response."""
-        # Look for ```c ... ``` blocks
-        pattern = r"```c\s*(.*?)\s*```"
-        matches = re.findall(pattern, response, re.DOTALL)
+        return extract_code(response)
 
-        if matches:
-            return matches[0].strip()
-
-        # Fallback: try to find any code block
-        pattern = r"```\s*(.*?)\s*```"
-        matches = re.findall(pattern, response, re.DOTALL)
+    def is_available(self) -> bool:
+        """
+        Check if Ollama is running and the model is available.
 
-        if matches:
-            return matches[0].strip()
+        The model list is fetched once and reused; a short connect timeout
+        makes the check fail fast when no server is listening.
+        """
+        if self._available_models is None:
+            try:
+                response = self._session.get(
+                    f"{self.base_url}/api/tags", timeout=(2, 5)
+                )
+                if response.status_code != 200:
+                    return False
+                models = response.json().get("models", [])
+                self._available_models = tuple(m.get("name", "") for m in models)
+            except:
+                return False
 
-        # Last resort: return as-is (might be raw code)
-        return response.strip()
+        # Check if our model is in the list (handle tag variations)
+        base_model = self.model.split(":")[0]
+        return any(base_model in name for name in self._available_models)
 
-    def is_available(self) -> bool:
-        """Check if Ollama is running and the model is available."""
-        try:
-            response = requests.get(f"{self.base_url}/api/tags", timeout=5)
-            if response.status_code == 200:
-                models = response.json().get("models", [])
-                model_names = [m.get("name", "") for m in models]
-                # Check if our model is in the list (handle tag variations)
-                base_model = self.model.split(":")[0]
-                return any(base_model in name for name in model_names)
-            return False
-        except:
-            return False
+    def close(self) -> None:
+        """Release the pooled HTTP connections."""
+        self._session.close()
@@ -1,10 +1,11 @@
 """OpenAI model adapter."""
 
-import re
-from typing import Optional
+from typing import Iterator, Optional
 
 from openai import OpenAI
 
+from .extract import extract_code
+
 
 # Models that don't support custom temperature (only default=1)
 MODELS_NO_TEMPERATURE = [
@@ -20,6 +21,7 @@ MODELS_NO_TEMPERATURE = [
     "o3-pro",
     "o4-mini",
 ]
+_NO_TEMPERATURE_PREFIXES = tuple(MODELS_NO_TEMPERATURE)
 
 
 class OpenAIAdapter:
@@ -34,16 +36,14 @@ class OpenAIAdapter:
         self.model = model
         self.temperature = temperature
         self.client = OpenAI(api_key=api_key)
+        self._supports_temp = self._supports_temperature()
 
     def _supports_temperature(self) -> bool:
         """Check if the model supports custom temperature."""
-        for prefix in MODELS_NO_TEMPERATURE:
-            if self.model.startswith(prefix):
-                return False
-        return True
+        return not self.model.startswith(_NO_TEMPERATURE_PREFIXES)
 
-    def invoke(self, prompt: str, system_prompt: str = None) -> str:
-        """Send prompt to model and get response."""
+    def _request_kwargs(self, prompt: str, system_prompt: str = None) -> dict:
+        """Build the chat completion request."""
         messages = []
 
         if system_prompt:
@@ -57,28 +57,31 @@ class OpenAIAdapter:
             "messages": messages,
         }
 
-        if self._supports_temperature():
+        if self._supports_temp:
             kwargs["temperature"] = self.temperature
 
-        response = self.client.chat.completions.create(**kwargs)
+        return kwargs
 
-        return response.choices[0].message.content
-
-    def extract_code(self, response: str) -> str:
-        """Extract C code from markdown response."""
-        # Look for ```c ... ``` blocks
-        pattern = r"```c\s*(.*?)\s*```"
-        matches = re.findall(pattern, response, re.DOTALL)
+    def invoke(self, prompt: str, system_prompt: str = None) -> str:
+        """Send prompt to model and get response."""
+        response = self.client.chat.completions.create(
+            **self._request_kwargs(prompt, system_prompt)
+        )
 
-        if matches:
-            return matches[0].strip()
+        return response.choices[0].message.content
 
-        # Fallback: try to find any code block
-        pattern = r"```\s*(.*?)\s*```"
-        matches = re.findall(pattern, response, re.DOTALL)
+    def invoke_stream(self, prompt: str, system_prompt: str = None) -> Iterator[str]:
+        """Send prompt to model and yield the response text as it arrives."""
+        stream = self.client.chat.completions.create(
+            stream=True, **self._request_kwargs(prompt, system_prompt)
+        )
 
-        if matches:
-            return matches[0].strip()
+        # Closing the generator early closes the stream and ends generation
+        with stream:
+            for chunk in stream:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
 
-        # Last resort: return as-is (might be raw code)
-        return response.strip()
+    def extract_code(self, response: str) -> str:
+        """Extract C code from markdown response."""
+        return extract_code(response)
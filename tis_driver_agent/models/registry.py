@@ -1,7 +1,8 @@
 """Model registry - centralized model configuration."""
 
 from dataclasses import dataclass
-from typing import List, Optional
+from functools import lru_cache
+from typing import Dict, Optional, Tuple
 
 # Known Ollama model prefixes (for auto-detection)
 OLLAMA_PREFIXES = [
@@ -25,7 +26,7 @@ ANTHROPIC_PREFIXES = [
 ]
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class ModelInfo:
     """Information about a model."""
     name: str
@@ -34,7 +35,7 @@ class ModelInfo:
 
 
 # Known models for autocomplete
-KNOWN_MODELS: List[ModelInfo] = [
+KNOWN_MODELS: Tuple[ModelInfo, ...] = (
     # OpenAI
     ModelInfo("gpt-4o-mini", "openai", "Fast, cheap, good quality"),
     ModelInfo("gpt-4o", "openai", "More capable"),
@@ -61,31 +62,47 @@ KNOWN_MODELS: List[ModelInfo] = [
     ModelInfo("mistral:7b-instruct", "ollama", "Fast and capable"),
     ModelInfo("codellama:latest", "ollama", "Code-focused"),
     ModelInfo("deepseek-coder:latest", "ollama", "Code-focused"),
-]
+)
+
+
+# Lookup tables built once at import time
+_OLLAMA_PREFIXES_TUPLE = tuple(OLLAMA_PREFIXES)
+_ANTHROPIC_PREFIXES_TUPLE = tuple(ANTHROPIC_PREFIXES)
+_MODEL_NAMES: Tuple[str, ...] = tuple(m.name for m in KNOWN_MODELS)
+_MODEL_BY_NAME: Dict[str, ModelInfo] = {m.name: m for m in KNOWN_MODELS}
+
+
+def get_model_names() -> Tuple[str, ...]:
+    """Return known model names for autocomplete."""
+    return _MODEL_NAMES
 
 
-def get_model_names() -> List[str]:
-    """Return list of known model names for autocomplete."""
-    return [m.name for m in KNOWN_MODELS]
+def get_model_info(model: str) -> Optional[ModelInfo]:
+    """Return the registry entry for a known model, or None."""
+    return _MODEL_BY_NAME.get(model)
 
 
 def is_ollama_model(model: str) -> bool:
     """Check if a model should use Ollama adapter."""
-    model_lower = model.lower()
-    return any(model_lower.startswith(prefix) for prefix in OLLAMA_PREFIXES)
+    return model.lower().startswith(_OLLAMA_PREFIXES_TUPLE)
 
 
 def is_anthropic_model(model: str) -> bool:
     """Check if a model should use Anthropic adapter."""
-    model_lower = model.lower()
-    return any(model_lower.startswith(prefix) for prefix in ANTHROPIC_PREFIXES)
+    return model.lower().startswith(_ANTHROPIC_PREFIXES_TUPLE)
 
 
+@lru_cache(maxsize=256)
 def get_provider(model: str) -> str:
-    """Determine the provider for a model."""
-    if is_ollama_model(model):
+    """Determine the provider for a model (cached per model name)."""
+    info = _MODEL_BY_NAME.get(model)
+    if info is not None:
+        return info.provider
+
+    model_lower = model.lower()
+    if model_lower.startswith(_OLLAMA_PREFIXES_TUPLE):
         return "ollama"
-    elif is_anthropic_model(model):
+    elif model_lower.startswith(_ANTHROPIC_PREFIXES_TUPLE):
         return "anthropic"
     else:
         return "openai"
@@ -2,6 +2,7 @@
 
 from ..state import DriverState
 from ..models.openai_adapter import OpenAIAdapter
+from ..models.extract import read_until_code_block
 from ..prompts.templates import build_generation_prompt
 from ..workflow_logger import get_logger, get_structured_logger
 
@@ -17,8 +18,8 @@ def generator_node(state: DriverState, model_adapter: OpenAIAdapter) -> DriverSt
         model=model_adapter.model,
     )
 
-    # Query model
-    response = model_adapter.invoke(prompt)
+    # Query model; generation stops once the driver's code block is complete
+    response, truncated = read_until_code_block(model_adapter.invoke_stream(prompt))
 
     # Extract code
     driver_code = model_adapter.extract_code(response)
@@ -40,6 +41,7 @@ def generator_node(state: DriverState, model_adapter: OpenAIAdapter) -> DriverSt
             step="generator",
             iteration=iteration,
             model=model_adapter.model,
+            truncated=truncated,
         )
         structured_logger.log_driver_code(
             code=driver_code,
@@ -48,7 +50,6 @@ def generator_node(state: DriverState, model_adapter: OpenAIAdapter) -> DriverSt
         )
 
     return {
-        **state,
         "current_driver_code": driver_code,
         "iteration": iteration,
         "status": "generating",
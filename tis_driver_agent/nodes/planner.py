@@ -11,7 +11,6 @@ def planner_node(state: DriverState) -> DriverState:
     # For Phase 1, we skip detailed planning
     # Just mark as ready to generate
     return {
-        **state,
         "plan": f"Generate driver for {state['function_name']}",
         "status": "planning",
     }
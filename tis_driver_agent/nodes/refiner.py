@@ -1,7 +1,10 @@
 """Refiner node - fixes compilation errors."""
 
+from itertools import chain
+
 from ..state import DriverState
 from ..models.openai_adapter import OpenAIAdapter
+from ..models.extract import read_until_code_block
 from ..prompts.templates import build_refiner_prompt
 from ..workflow_logger import get_logger, get_structured_logger
 
@@ -18,10 +21,14 @@ def refiner_node(state: DriverState, model_adapter: OpenAIAdapter) -> DriverStat
         logger.log_step("REFINER", iteration)
         logger.log_refine_context(validation_errors)
 
-    # Collect all errors
-    all_errors = []
-    for error_group in validation_errors:
-        all_errors.extend(error_group.get("errors", []))
+    # Collect all errors, dropping repeats (same error reported by several
+    # stages or translation units) but keeping first-seen order; the dict's
+    # keys are passed on as is
+    all_errors = dict.fromkeys(
+        chain.from_iterable(
+            error_group.get("errors", ()) for error_group in validation_errors
+        )
+    )
 
     # Build prompt
     prompt = build_refiner_prompt(
@@ -31,8 +38,8 @@ def refiner_node(state: DriverState, model_adapter: OpenAIAdapter) -> DriverStat
         max_iterations=state.get("max_iterations", 5),
     )
 
-    # Query model
-    response = model_adapter.invoke(prompt)
+    # Query model; generation stops once the driver's code block is complete
+    response, truncated = read_until_code_block(model_adapter.invoke_stream(prompt))
 
     # Extract code
     refined_code = model_adapter.extract_code(response)
@@ -50,6 +57,7 @@ def refiner_node(state: DriverState, model_adapter: OpenAIAdapter) -> DriverStat
             step="refiner",
             iteration=iteration,
             model=model_adapter.model,
+            truncated=truncated,
         )
         structured_logger.log_driver_code(
             code=refined_code,
@@ -58,7 +66,6 @@ def refiner_node(state: DriverState, model_adapter: OpenAIAdapter) -> DriverStat
         )
 
     return {
-        **state,
         "current_driver_code": refined_code,
         "iteration": iteration,
         "validation_errors": [],  # Clear for next validation
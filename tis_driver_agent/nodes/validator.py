@@ -1,9 +1,44 @@
 """Validator node - TIS compilation validation."""
 
+import hashlib
+import weakref
+from collections import OrderedDict
+from typing import Optional
+
 from ..state import DriverState
-from ..tis import TISRunnerBase
+from ..tis import TISRunnerBase, TISResult
 from ..workflow_logger import get_logger, get_structured_logger
 
+# Compile results per runner, keyed on (source file, source digest, function,
+# driver digest), so a driver the refiner reproduces verbatim is not compiled
+# again while the source file is unchanged
+_COMPILE_CACHE_SIZE = 256
+_compile_results: "weakref.WeakKeyDictionary[TISRunnerBase, OrderedDict]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _cached_compile(tis_runner: TISRunnerBase, key: tuple) -> Optional[TISResult]:
+    """Return an earlier compile result for key on this runner, if any."""
+    results = _compile_results.get(tis_runner)
+    if results is None or key not in results:
+        return None
+    results.move_to_end(key)
+    return results[key]
+
+
+def _store_compile(tis_runner: TISRunnerBase, key: tuple, tis_result: TISResult) -> None:
+    """Remember a compile result, evicting the least recently used."""
+    results = _compile_results.setdefault(tis_runner, OrderedDict())
+    results[key] = tis_result
+    while len(results) > _COMPILE_CACHE_SIZE:
+        results.popitem(last=False)
+
+
+def driver_filename(function_name: str) -> str:
+    """Name of the driver file the validator writes on the runner."""
+    return f"__tis_driver_{function_name}.c"
+
 
 def validator_node(
     state: DriverState,
@@ -21,10 +56,24 @@ def validator_node(
     source_file = state["source_file"]
 
     # Driver filename
-    driver_filename = f"__tis_driver_{state['function_name']}.c"
+    driver_file = driver_filename(state["function_name"])
+
+    driver_code = state["current_driver_code"]
+    # Results are only reused while the source file's contents are known
+    source_digest = tis_runner.file_digest(source_file)
+    compile_key = None
+    tis_result = None
+    if source_digest is not None:
+        compile_key = (
+            source_file,
+            source_digest,
+            state["function_name"],
+            hashlib.blake2b(driver_code.encode("utf-8"), digest_size=16).digest(),
+        )
+        tis_result = _cached_compile(tis_runner, compile_key)
 
-    # Write driver to runner's location
-    if not tis_runner.write_driver(state["current_driver_code"], driver_filename):
+    # Write driver to runner's location (not needed when the result is known)
+    if tis_result is None and not tis_runner.write_driver(driver_code, driver_file):
         structured_logger = get_structured_logger()
         if structured_logger:
             try:
@@ -45,85 +94,85 @@ def validator_node(
                 pass  # Ignore logging failures
 
         return {
-            **state,
             "tis_result": None,
             "validation_errors": [{"stage": "write", "errors": ["Failed to write driver"]}],
             "status": "validating",
         }
 
-    try:
+    if tis_result is None:
         tis_result = tis_runner.tis_compile(
-            driver_path=driver_filename,
+            driver_path=driver_file,
             source_files=[source_file],
             reference_file=source_file,
             compilation_db=None,
             function_name=state["function_name"],
         )
+        # exit_code -1 means the runner failed (SSH error, timeout), not the
+        # compiler; don't replay that when the same driver comes back
+        if compile_key is not None and tis_result.exit_code != -1:
+            _store_compile(tis_runner, compile_key, tis_result)
 
-        # Log TIS result
-        if logger:
-            logger.log_tis_result(
-                success=tis_result.success,
-                command=tis_result.command,
-                exit_code=tis_result.exit_code,
-                stdout=tis_result.stdout,
-                stderr=tis_result.stderr,
-                errors=tis_result.errors,
-            )
+    # Log TIS result
+    if logger:
+        logger.log_tis_result(
+            success=tis_result.success,
+            command=tis_result.command,
+            exit_code=tis_result.exit_code,
+            stdout=tis_result.stdout,
+            stderr=tis_result.stderr,
+            errors=tis_result.errors,
+        )
 
+    if not tis_result.success:
+        errors.append(
+            {
+                "stage": "tis_compile",
+                "errors": tis_result.errors,
+                "stderr": tis_result.stderr,
+            }
+        )
+
+    # Log validation decision
+    is_valid = tis_result.success
+    if logger:
+        error_summary = ""
         if not tis_result.success:
-            errors.append(
-                {
-                    "stage": "tis_compile",
-                    "errors": tis_result.errors,
-                    "stderr": tis_result.stderr,
-                }
-            )
+            error_summary = f"TIS failed with {len(tis_result.errors)} errors"
+        logger.log_validation_decision(
+            is_valid=is_valid,
+            tis_success=tis_result.success,
+            error_summary=error_summary,
+        )
 
-        # Log validation decision
-        is_valid = tis_result.success
-        if logger:
-            error_summary = ""
-            if not tis_result.success:
-                error_summary = f"TIS failed with {len(tis_result.errors)} errors"
-            logger.log_validation_decision(
+    # Log to structured logger
+    structured_logger = get_structured_logger()
+    if structured_logger:
+        try:
+            structured_logger.log_validation(
+                iteration=iteration,
+                tis_result={
+                    "success": tis_result.success,
+                    "command": tis_result.command,
+                    "exit_code": tis_result.exit_code,
+                    "errors": list(tis_result.errors),
+                    "stdout": tis_result.stdout,
+                    "stderr": tis_result.stderr,
+                    "info_json": tis_result.info_json,
+                },
                 is_valid=is_valid,
-                tis_success=tis_result.success,
-                error_summary=error_summary,
             )
+        except Exception:
+            pass  # Ignore logging failures
 
-        # Log to structured logger
-        structured_logger = get_structured_logger()
-        if structured_logger:
-            try:
-                structured_logger.log_validation(
-                    iteration=iteration,
-                    tis_result={
-                        "success": tis_result.success,
-                        "command": tis_result.command,
-                        "exit_code": tis_result.exit_code,
-                        "errors": list(tis_result.errors),
-                        "stdout": tis_result.stdout,
-                        "stderr": tis_result.stderr,
-                        "info_json": tis_result.info_json,
-                    },
-                    is_valid=is_valid,
-                )
-            except Exception:
-                pass  # Ignore logging failures
-
-        return {
-            **state,
-            "tis_result": {
-                "success": tis_result.success,
-                "errors": tis_result.errors,
-                "command": tis_result.command,
-                "info_json": tis_result.info_json,
-            },
-            "validation_errors": errors,
-            "status": "validating",
-        }
-
-    finally:
-        # Cleanup driver file on runner
-        tis_runner.cleanup(driver_filename)
+    # The driver file stays on the runner: write_driver overwrites it in place
+    # on the next round, and the workflow's output handler removes it
+    return {
+        "tis_result": {
+            "success": tis_result.success,
+            "errors": tis_result.errors,
+            "command": tis_result.command,
+            "info_json": tis_result.info_json,
+        },
+        "validation_errors": errors,
+        "status": "validating",
+    }
@@ -1,6 +1,6 @@
 """Prompt templates for driver generation."""
 
-from typing import List, Dict
+from typing import Collection, Dict, List
 
 # Condensed TIS builtin reference for prompts (no ACSL, no C++ macros, no URLs)
 TIS_BUILTIN_REFERENCE = """
@@ -238,9 +238,9 @@ def build_generation_prompt(
 
 
 def build_refiner_prompt(
-    current_code: str, errors: list, iteration: int, max_iterations: int
+    current_code: str, errors: Collection[str], iteration: int, max_iterations: int
 ) -> str:
-    """Build the refinement prompt."""
+    """Build the refinement prompt (errors: any sized collection of messages)."""
     if errors:
         error_text = "\n".join(errors)
     else:
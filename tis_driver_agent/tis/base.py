@@ -43,6 +43,10 @@ class TISRunnerBase(ABC):
         """Clean up temporary files."""
         pass
 
+    def file_digest(self, file_path: str) -> Optional[str]:
+        """SHA-256 hex digest of a file's contents, or None if unavailable."""
+        return None
+
     def parse_tis_errors(self, output: str) -> List[str]:
         """Extract compilation errors from TIS output (not UB alarms).
 
@@ -1,5 +1,6 @@
 """Local TIS runner - assumes tis-analyzer is in PATH."""
 
+import hashlib
 import json
 import os
 import re
@@ -62,6 +63,14 @@ class LocalTISRunner(TISRunnerBase):
         except Exception:
             return None
 
+    def file_digest(self, file_path: str) -> Optional[str]:
+        """SHA-256 hex digest of a local file's contents."""
+        try:
+            with open(os.path.join(self.work_dir, file_path), "rb") as f:
+                return hashlib.sha256(f.read()).hexdigest()
+        except OSError:
+            return None
+
     def find_header_files(self, include_paths: List[str], header_name: str) -> Optional[str]:
         """Find a header file in the given include paths."""
         for inc_path in include_paths:
@@ -32,9 +32,12 @@ class RemoteTISRunner(TISRunnerBase):
         self.machdep = machdep
         self.timeout = timeout
         self.client: Optional[paramiko.SSHClient] = None
+        # SFTP session reused for every driver upload on this connection
+        self._sftp: Optional[paramiko.SFTPClient] = None
 
     def connect(self) -> None:
         """Establish SSH connection."""
+        self._close_sftp()
         self.client = paramiko.SSHClient()
         self.client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
         self.client.connect(
@@ -46,10 +49,28 @@ class RemoteTISRunner(TISRunnerBase):
 
     def disconnect(self) -> None:
         """Close SSH connection."""
+        self._close_sftp()
         if self.client:
             self.client.close()
             self.client = None
 
+    def _get_sftp(self):
+        """Return the SFTP session, opening it on first use."""
+        if not self.client:
+            self.connect()
+        if self._sftp is None:
+            self._sftp = self.client.open_sftp()
+        return self._sftp
+
+    def _close_sftp(self) -> None:
+        """Close the SFTP session, if open."""
+        if self._sftp is not None:
+            try:
+                self._sftp.close()
+            except Exception:
+                pass
+            self._sftp = None
+
     def _run_command(self, command: str, with_tis_env: bool = False) -> tuple:
         """Run a command on remote server."""
         if not self.client:
@@ -74,6 +95,18 @@ class RemoteTISRunner(TISRunnerBase):
 
         return stdout
 
+    def file_digest(self, file_path: str) -> Optional[str]:
+        """SHA-256 hex digest of a remote file's contents, computed on the remote."""
+        try:
+            stdout, _, exit_code = self._run_command(
+                f"cd {self.remote_work_dir} && sha256sum {file_path}"
+            )
+        except Exception:
+            return None
+        if exit_code != 0 or not stdout:
+            return None
+        return stdout.split()[0]
+
     def find_header_files(self, include_paths: List[str], header_name: str) -> Optional[str]:
         """Find a header file in the given include paths on remote."""
         for inc_path in include_paths:
@@ -153,10 +186,11 @@ class RemoteTISRunner(TISRunnerBase):
         """Fetch and parse the TIS info JSON results file from remote."""
         try:
             json_path = f"{self.remote_work_dir}/{json_filename}"
-            content = self.read_remote_file(json_path)
-            if content:
-                # Clean up the file after reading
-                self._run_command(f"rm -f {json_path}")
+            # Read and clean up the file in one command
+            content, _, exit_code = self._run_command(
+                f"cat {json_path} && rm -f {json_path}"
+            )
+            if exit_code == 0 and content:
                 return json.loads(content)
         except (json.JSONDecodeError, Exception):
             pass
@@ -165,18 +199,16 @@ class RemoteTISRunner(TISRunnerBase):
     def write_driver(self, driver_code: str, driver_path: str) -> bool:
         """Write driver code to remote file."""
         try:
-            if not self.client:
-                self.connect()
-
-            sftp = self.client.open_sftp()
+            sftp = self._get_sftp()
             full_path = f"{self.remote_work_dir}/{driver_path}"
 
             with sftp.file(full_path, "w") as f:
                 f.write(driver_code)
 
-            sftp.close()
             return True
         except Exception as e:
+            # Reopen the session on the next write
+            self._close_sftp()
             import sys
             print(f"Warning: Failed to write driver to {self.remote_work_dir}/{driver_path}: {e}", file=sys.stderr)
             return False
@@ -1,6 +1,7 @@
 """Context builder - assembles context files based on selected mode."""
 
 import os
+import sys
 from typing import List, Dict, Optional, Callable
 
 from .context_detector import parse_includes, extract_function
@@ -158,6 +159,7 @@ class ContextBuilder:
 
         try:
             from ..context.assembler import assemble_context, get_context_summary
+            from ..context.lookup import IndexOutdatedError
 
             ast_context = assemble_context(index_path, function_name)
             if ast_context:
@@ -180,3 +182,8 @@ class ContextBuilder:
             if self.verbose:
                 print("Context mode: ast (assembler not available, using function extraction)")
             return self._build_function_context(source_content, source_filename, function_name)
+        except IndexOutdatedError as e:
+            print(f"Warning: {e}", file=sys.stderr)
+            if self.verbose:
+                print("Context mode: ast (index out of date, using function extraction)")
+            return self._build_function_context(source_content, source_filename, function_name)
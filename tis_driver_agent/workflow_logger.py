@@ -2,12 +2,63 @@
 
 import json
 import os
+import queue
+import sys
+import threading
+import weakref
 from datetime import datetime
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple
+
+try:
+    import orjson
+
+    def _encode_json(data: Dict[str, Any]) -> bytes:
+        """Serialize data as indented JSON."""
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+except ImportError:
+    def _encode_json(data: Dict[str, Any]) -> bytes:
+        """Serialize data as indented JSON."""
+        return json.dumps(data, indent=2).encode("utf-8")
+
+
+def _write_file(filepath: str, data: bytes, failures: List[Tuple[str, OSError]]) -> None:
+    """Write a log file, recording a failure instead of raising."""
+    try:
+        with open(filepath, "wb") as f:
+            f.write(data)
+    except OSError as e:
+        failures.append((filepath, e))
+        print(f"Warning: Failed to write log file {filepath}: {e}", file=sys.stderr)
+
+
+def _run_writes(pending: "queue.Queue", failures: List[Tuple[str, OSError]]) -> None:
+    """Writer thread: write queued files in order until the stop sentinel."""
+    while True:
+        item = pending.get()
+        try:
+            if item is None:
+                return
+            _write_file(*item, failures)
+        finally:
+            pending.task_done()
+
+
+def _stop_writer(pending: "queue.Queue", writer: threading.Thread) -> None:
+    """Write out the queued files and stop the writer thread."""
+    pending.put(None)
+    writer.join()
 
 
 class StructuredLogger:
-    """Logs workflow artifacts to separate files in a logs directory."""
+    """
+    Logs workflow artifacts to separate files in a logs directory.
+
+    File contents are serialized on the caller's thread; only the disk
+    writes run on a background thread, so workflow nodes don't wait on
+    them. flush() waits for pending writes and close() also stops the
+    thread. Both return the writes that failed. A logger that is never
+    closed is closed when it is garbage collected or at interpreter exit.
+    """
 
     def __init__(self, logs_dir: str):
         """
@@ -19,6 +70,57 @@ class StructuredLogger:
         self.logs_dir = logs_dir
         self._step_counter = 0
         self._ensure_dir()
+        self._pending: "queue.Queue[Optional[Tuple[str, bytes]]]" = queue.Queue(maxsize=1024)
+        self._failures: List[Tuple[str, OSError]] = []
+        self._closed = False
+        # The thread and the finalizer must not reference self, or the
+        # logger would never be collected
+        writer = threading.Thread(
+            target=_run_writes,
+            args=(self._pending, self._failures),
+            name="structured-logger",
+            daemon=True,
+        )
+        writer.start()
+        self._stop = weakref.finalize(self, _stop_writer, self._pending, writer)
+
+    def _submit(self, data: bytes, filepath: str) -> None:
+        """Queue a write for the writer thread (or write now once closed)."""
+        if self._closed:
+            _write_file(filepath, data, self._failures)
+            return
+        self._pending.put((filepath, data))
+
+    def _take_failures(self) -> List[Tuple[str, OSError]]:
+        """Remove and return the failed writes recorded so far."""
+        failures = self._failures[:]
+        del self._failures[:len(failures)]
+        return failures
+
+    def flush(self) -> List[Tuple[str, OSError]]:
+        """
+        Wait until all queued log files are written.
+
+        Returns:
+            (filepath, error) of each write that failed since the last
+            flush() or close()
+        """
+        self._pending.join()
+        return self._take_failures()
+
+    def close(self) -> List[Tuple[str, OSError]]:
+        """
+        Write out pending log files and stop the writer thread.
+
+        Later log calls write their files directly.
+
+        Returns:
+            (filepath, error) of each write that failed since the last
+            flush() or close()
+        """
+        self._closed = True
+        self._stop()
+        return self._take_failures()
 
     def _ensure_dir(self):
         """Create logs directory if it doesn't exist."""
@@ -45,12 +147,14 @@ class StructuredLogger:
         filename = f"{idx:03d}_{step}_iter{iteration}_driver.c"
         filepath = os.path.join(self.logs_dir, filename)
 
-        with open(filepath, "w") as f:
-            f.write(f"// Step: {step}\n")
-            f.write(f"// Iteration: {iteration}\n")
-            f.write(f"// Timestamp: {datetime.now().isoformat()}\n")
-            f.write("// " + "=" * 60 + "\n\n")
-            f.write(code)
+        text = (
+            f"// Step: {step}\n"
+            f"// Iteration: {iteration}\n"
+            f"// Timestamp: {datetime.now().isoformat()}\n"
+            "// " + "=" * 60 + "\n\n"
+            + code
+        )
+        self._submit(text.encode("utf-8"), filepath)
 
         return filepath
 
@@ -61,6 +165,7 @@ class StructuredLogger:
         step: str,
         iteration: int,
         model: str = "",
+        truncated: bool = False,
     ) -> str:
         """
         Log LLM query and response to a file.
@@ -71,6 +176,8 @@ class StructuredLogger:
             step: Step name (generator, refiner)
             iteration: Current iteration number
             model: Model name
+            truncated: Whether the response was cut off after its code block
+                       (see read_until_code_block)
 
         Returns:
             Path to the created file
@@ -79,17 +186,21 @@ class StructuredLogger:
         filename = f"{idx:03d}_{step}_iter{iteration}_query.md"
         filepath = os.path.join(self.logs_dir, filename)
 
-        with open(filepath, "w") as f:
-            f.write(f"Step: {step}\n")
-            f.write(f"Iteration: {iteration}\n")
-            f.write(f"Model: {model}\n")
-            f.write(f"Timestamp: {datetime.now().isoformat()}\n")
-            f.write("=" * 80 + "\n\n")
-            f.write("=== PROMPT ===\n")
-            f.write(prompt)
-            f.write("\n\n" + "=" * 80 + "\n\n")
-            f.write("=== RESPONSE ===\n")
-            f.write(response)
+        text = (
+            f"Step: {step}\n"
+            f"Iteration: {iteration}\n"
+            f"Model: {model}\n"
+            f"Timestamp: {datetime.now().isoformat()}\n"
+            + "=" * 80 + "\n\n"
+            "=== PROMPT ===\n"
+            + prompt
+            + "\n\n" + "=" * 80 + "\n\n"
+            "=== RESPONSE ===\n"
+            + response
+        )
+        if truncated:
+            text += "\n\n[Response cut off after the code block; the rest was not generated]\n"
+        self._submit(text.encode("utf-8"), filepath)
 
         return filepath
 
@@ -122,8 +233,7 @@ class StructuredLogger:
             "tis_compile": tis_result,
         }
 
-        with open(filepath, "w") as f:
-            json.dump(data, f, indent=2)
+        self._submit(_encode_json(data), filepath)
 
         # If validation failed, also create a plain text error file
         if not is_valid:
@@ -164,8 +274,7 @@ class StructuredLogger:
                 lines.append("Output:")
                 lines.append(tis_result["stdout"])
 
-        with open(filepath, "w") as f:
-            f.write("\n".join(lines))
+        self._submit("\n".join(lines).encode("utf-8"), filepath)
 
         return filepath
 
@@ -201,8 +310,7 @@ class StructuredLogger:
             "source_file": source_file,
         }
 
-        with open(filepath, "w") as f:
-            json.dump(data, f, indent=2)
+        self._submit(_encode_json(data), filepath)
 
         return filepath
 